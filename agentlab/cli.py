@@ -2,25 +2,82 @@
 
 from __future__ import annotations
 
+import glob
 import json
+import sys
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 
 import typer
 from rich import print
 from rich.console import Console
-from rich.live import Live
 from rich.panel import Panel
 
 from .config_loader import load_blueprint
-from .evaluator import run_evaluations
-from .runner import run_agent
+from .eval_store import EvalResultStore
+from .eval_suite import (
+    SuiteOptions,
+    merge_suite_shards,
+    resolve_blueprints,
+    run_evaluation_suite,
+)
+from .evaluator import (
+    merge_shard_summaries,
+    parse_shard,
+    run_evaluations,
+    write_junit_suites,
+)
+from .llm.cache import ResponseCache
+from .llm.ollama_client import pool_stats
+from .runner import run_agent, run_batch
 from .scaffold import create_blueprint_scaffold
+from .tools.memo import enable_tool_cache_persistence, tool_cache_stats
 from .tools.openapi.ingest import ingest_openapi
+from .tools.runtime.http_cache import enable_http_cache, http_cache_stats
+from .tools.runtime.http_tool import close_http_clients
+from .tracing import trace
+from .utils.jsonl import dumps_line, iter_jsonl
+from .utils.kvstore import DEFAULT_CACHE_DIR
 
 app = typer.Typer(add_completion=False, help="AgentLab CLI")
 console = Console()
 
 
+@contextmanager
+def _session(trace_path: Optional[Path]) -> Iterator[ExitStack]:
+    """Scope of one command: optional span recording, then shutdown of pooled API clients and
+    the tool memo's disk store. Caches the command opens are registered on the yielded stack
+    and closed on the way out."""
+    try:
+        with ExitStack() as resources:
+            if trace_path is None:
+                yield resources
+                return
+            with trace() as tracer:
+                try:
+                    yield resources
+                finally:
+                    tracer.write_chrome_trace(trace_path)
+    finally:
+        close_http_clients()
+        enable_tool_cache_persistence(None)
+
+
+def _add_pool_stats(summary: Dict[str, Any]) -> None:
+    """Report LLM connection pool reuse (hits/misses/open) when the command used the pool."""
+    stats = pool_stats()
+    if stats["hits"] or stats["misses"]:
+        summary["llm_pool"] = stats
+
+
+def _cache_root(cache_dir: Optional[Path], *wanted: bool) -> Optional[Path]:
+    """Disk cache directory: --cache-dir when given, the default when a cache flag asks for one."""
+    if cache_dir is not None:
+        return cache_dir
+    return DEFAULT_CACHE_DIR if any(wanted) else None
+
+
 @app.command()
 def run(
     blueprint: Path = typer.Argument(..., exists=True, help="Path to agent blueprint YAML"),
@@ -45,22 +102,58 @@ def run(
     openapi_base_url: str = typer.Option(
         None, "--openapi-base-url", help="Override base URL when ingesting --openapi-spec"
     ),
+    cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse cached LLM responses for identical prompts"
+    ),
+    cache_dir: Path = typer.Option(
+        None,
+        "--cache-dir",
+        help="Directory for the response, HTTP, OpenAPI spec, blueprint and eval result caches "
+        f"(default {DEFAULT_CACHE_DIR} when a cache flag is set; giving it enables disk caching)",
+    ),
+    http_cache: bool = typer.Option(
+        False,
+        "--http-cache/--no-http-cache",
+        help="Cache API tool GET responses per their Cache-Control/ETag headers",
+    ),
+    trace_path: Path = typer.Option(
+        None, "--trace", help="Write a Chrome trace (JSON) of timed spans to this path"
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Include a per-step timing breakdown in the result"
+    ),
 ):
     """Run a single agent from a blueprint."""
-    bp = load_blueprint(blueprint)
-    # Optional: ingest OpenAPI tools in-process so they are available to the run
-    if openapi_spec:
-        ingest_openapi(openapi_spec, tag=openapi_tag, base_url_override=openapi_base_url)
-    # Determine payload precedence: file > json > text
-    payload = input_text
-    if input_json:
-        payload = json.loads(input_json)
-    if input_file:
-        payload = json.loads(Path(input_file).read_text(encoding="utf-8"))
-    if stream:
-        # Display incremental output while the agent runs
-        with Live(refresh_per_second=8, console=console) as live:
-            # Run once; our run_agent handles streaming accumulation
+    root = _cache_root(cache_dir, cache, http_cache)
+    with _session(trace_path) as resources:
+        if http_cache and root:
+            enable_http_cache(root)
+        bp = load_blueprint(blueprint, cache_dir=root)
+        # Optional: ingest OpenAPI tools in-process so they are available to the run
+        if openapi_spec:
+            ingest_openapi(
+                openapi_spec,
+                tag=openapi_tag,
+                base_url_override=openapi_base_url,
+                cache_dir=root,
+            )
+        # Determine payload precedence: file > json > text
+        payload = input_text
+        if input_json:
+            payload = json.loads(input_json)
+        if input_file:
+            payload = json.loads(Path(input_file).read_text(encoding="utf-8"))
+        response_cache = None
+        if cache and root:
+            response_cache = ResponseCache(root)
+            resources.callback(response_cache.close)
+            enable_tool_cache_persistence(root)
+        if stream:
+            # Print visible tokens as they arrive; the full result follows once generation ends
+            def _print_token(tok: str) -> None:
+                sys.stdout.write(tok)
+                sys.stdout.flush()
+
             result = run_agent(
                 bp,
                 input_text=payload,
@@ -68,25 +161,38 @@ def run(
                 stream=True,
                 generation_kwargs={"temperature": temperature, "top_p": top_p},
                 strip_think=strip_think,
+                cache=response_cache,
+                timings=timings,
+                on_token=_print_token,
             )
-            live.update(Panel.fit("[bold]Result[/bold]"))
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-    else:
-        result = run_agent(
-            bp,
-            input_text=payload,
-            model_name=model,
-            stream=False,
-            generation_kwargs={"temperature": temperature, "top_p": top_p},
-            strip_think=strip_think,
-        )
+            sys.stdout.write("\n")
+            ttft = result.get("first_visible_token_ms")
+            if ttft is not None:
+                console.print(f"[dim]first visible token after {ttft:.0f} ms[/dim]")
+        else:
+            result = run_agent(
+                bp,
+                input_text=payload,
+                model_name=model,
+                stream=False,
+                generation_kwargs={"temperature": temperature, "top_p": top_p},
+                strip_think=strip_think,
+                cache=response_cache,
+                timings=timings,
+            )
+        tool_cache = tool_cache_stats()
+        if tool_cache:
+            result["tool_cache"] = tool_cache
+        _add_pool_stats(result)
         console.print(Panel.fit("[bold]Result[/bold]"))
         print(json.dumps(result, indent=2, ensure_ascii=False))
 
 
 @app.command()
 def eval(
-    blueprint: Path = typer.Argument(..., exists=True, help="Path to agent blueprint YAML"),
+    blueprint: str = typer.Argument(
+        ..., help="Blueprint YAML, or a directory or glob of blueprints to evaluate in parallel"
+    ),
     model: str = typer.Option("qwen3:8b", "--model", help="Ollama model name"),
     junit: Path = typer.Option(None, "--junit", help="Optional JUnit XML output path"),
     no_strip_think: bool = typer.Option(
@@ -101,17 +207,243 @@ def eval(
     openapi_base_url: str = typer.Option(
         None, "--openapi-base-url", help="Override base URL when ingesting --openapi-spec"
     ),
+    cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse cached LLM responses for identical prompts"
+    ),
+    cache_dir: Path = typer.Option(
+        None,
+        "--cache-dir",
+        help="Directory for the response, HTTP, OpenAPI spec, blueprint and eval result caches "
+        f"(default {DEFAULT_CACHE_DIR} when a cache flag is set; giving it enables disk caching)",
+    ),
+    http_cache: bool = typer.Option(
+        False,
+        "--http-cache/--no-http-cache",
+        help="Cache API tool GET responses per their Cache-Control/ETag headers",
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", help="Max evaluation cases generating at once (per blueprint)"
+    ),
+    workers: int = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Worker processes for many blueprints (default: CPU count, or 1 with --trace)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental/--no-incremental",
+        help="Reuse stored outputs of cases whose prompt, plan, tool args, model and input are "
+        "unchanged; only their checks run again",
+    ),
+    shard: str = typer.Option(
+        None, "--shard", help="Run only shard i of n (e.g. 2/4); merge parts with eval-merge"
+    ),
+    output: Path = typer.Option(
+        None, "--output", "-o", help="Also write the summary JSON to this path"
+    ),
+    trace_path: Path = typer.Option(
+        None, "--trace", help="Write a Chrome trace (JSON) of timed spans to this path"
+    ),
 ):
     """Run the blueprint's evaluation cases and report pass/fail."""
-    bp = load_blueprint(blueprint)
-    if openapi_spec:
-        ingest_openapi(openapi_spec, tag=openapi_tag, base_url_override=openapi_base_url)
-    # Positional call keeps typing simple across mypy versions
-    summary = run_evaluations(bp, model, not no_strip_think, str(junit) if junit else None)
+    paths = resolve_blueprints(blueprint)
+    if not paths:
+        raise typer.BadParameter(f"No blueprint files found for {blueprint!r}")
+    try:
+        shard_spec = parse_shard(shard) if shard else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    if trace_path is not None:
+        # Spans are recorded in this process only, so worker processes would be missing
+        if workers is not None and workers > 1:
+            raise typer.BadParameter("--trace cannot follow worker processes; use --workers 1")
+        workers = 1
+    root = _cache_root(cache_dir, cache, http_cache, incremental)
+    if len(paths) > 1 or Path(blueprint).is_dir() or glob.has_magic(blueprint):
+        options = SuiteOptions(
+            model_name=model,
+            strip_think=not no_strip_think,
+            concurrency=concurrency,
+            cache_dir=str(root) if root else None,
+            cache=cache,
+            http_cache=http_cache,
+            openapi_spec=openapi_spec,
+            openapi_tag=openapi_tag,
+            openapi_base_url=openapi_base_url,
+            shard=shard_spec,
+            incremental=incremental,
+        )
+        with _session(trace_path):
+            summary = run_evaluation_suite(paths, options, workers, str(junit) if junit else None)
+        _print_summary(summary, output)
+        return
+    with _session(trace_path) as resources:
+        if http_cache and root:
+            enable_http_cache(root)
+        bp = load_blueprint(paths[0], cache_dir=root)
+        if openapi_spec:
+            ingest_openapi(
+                openapi_spec,
+                tag=openapi_tag,
+                base_url_override=openapi_base_url,
+                cache_dir=root,
+            )
+        response_cache = None
+        if cache and root:
+            response_cache = ResponseCache(root)
+            resources.callback(response_cache.close)
+            enable_tool_cache_persistence(root)
+        store = None
+        if incremental and root:
+            store = EvalResultStore(root)
+            resources.callback(store.close)
+        # Positional call keeps typing simple across mypy versions
+        summary = run_evaluations(
+            bp,
+            model,
+            not no_strip_think,
+            str(junit) if junit else None,
+            response_cache,
+            concurrency,
+            shard_spec,
+            store,
+        )
+        tool_cache = tool_cache_stats()
+        if tool_cache:
+            summary["tool_cache"] = tool_cache
+        if http_cache:
+            summary["http_cache"] = http_cache_stats()
+        _add_pool_stats(summary)
+        _print_summary(summary, output)
+
+
+@app.command("eval-merge")
+def eval_merge(
+    parts: List[Path] = typer.Argument(
+        ..., exists=True, help="Summary JSON files written by eval --shard ... -o"
+    ),
+    output: Path = typer.Option(
+        None, "--output", "-o", help="Also write the merged summary JSON to this path"
+    ),
+    junit: Path = typer.Option(None, "--junit", help="Optional JUnit XML output path"),
+):
+    """Merge sharded evaluation results into one summary."""
+    loaded = [json.loads(p.read_text(encoding="utf-8")) for p in parts]
+    try:
+        if all("suites" in part for part in loaded):
+            summary = merge_suite_shards(loaded)
+            suites = summary["suites"]
+        else:
+            summary = merge_shard_summaries(loaded)
+            suites = [summary]
+    except (KeyError, ValueError) as e:
+        raise typer.BadParameter(f"Cannot merge shard results: {e}") from None
+    if junit:
+        write_junit_suites(str(junit), suites)
+    _print_summary(summary, output)
+
+
+def _print_summary(summary: Dict[str, Any], output: Optional[Path]) -> None:
+    if output:
+        output.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
     console.print(Panel.fit("[bold]Evaluation Summary[/bold]"))
     print(json.dumps(summary, indent=2, ensure_ascii=False))
 
 
+@app.command()
+def batch(
+    blueprint: Path = typer.Argument(..., exists=True, help="Path to agent blueprint YAML"),
+    inputs: str = typer.Argument("-", help="JSONL file with one input per line ('-' for stdin)"),
+    output: Path = typer.Option(
+        None, "--output", "-o", help="Write JSONL results here instead of stdout"
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Max runs in flight"),
+    ordered: bool = typer.Option(
+        True, "--ordered/--unordered", help="Emit results in input order or as they finish"
+    ),
+    temperature: float = typer.Option(0.0, "--temperature", help="LLM temperature (default 0)"),
+    top_p: float = typer.Option(1.0, "--top-p", help="LLM top-p (default 1)"),
+    model: str = typer.Option("qwen3:8b", "--model", help="Ollama model name"),
+    strip_think: bool = typer.Option(
+        False, "--strip-think", help="Strip <think> tags from outputs"
+    ),
+    openapi_spec: str = typer.Option(
+        None, "--openapi-spec", help="Optional OpenAPI spec URL or file to ingest before run"
+    ),
+    openapi_tag: str = typer.Option(
+        "api", "--openapi-tag", help="Tag/prefix for tools from --openapi-spec"
+    ),
+    openapi_base_url: str = typer.Option(
+        None, "--openapi-base-url", help="Override base URL when ingesting --openapi-spec"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse cached LLM responses for identical prompts"
+    ),
+    cache_dir: Path = typer.Option(
+        None,
+        "--cache-dir",
+        help="Directory for the response, HTTP, OpenAPI spec, blueprint and eval result caches "
+        f"(default {DEFAULT_CACHE_DIR} when a cache flag is set; giving it enables disk caching)",
+    ),
+    http_cache: bool = typer.Option(
+        False,
+        "--http-cache/--no-http-cache",
+        help="Cache API tool GET responses per their Cache-Control/ETag headers",
+    ),
+    trace_path: Path = typer.Option(
+        None, "--trace", help="Write a Chrome trace (JSON) of timed spans to this path"
+    ),
+):
+    """Run a blueprint over a JSONL file of inputs, writing one JSONL result per line."""
+    root = _cache_root(cache_dir, cache, http_cache)
+    with _session(trace_path) as resources:
+        if http_cache and root:
+            enable_http_cache(root)
+        bp = load_blueprint(blueprint, cache_dir=root)
+        if openapi_spec:
+            ingest_openapi(
+                openapi_spec,
+                tag=openapi_tag,
+                base_url_override=openapi_base_url,
+                cache_dir=root,
+            )
+        response_cache = None
+        if cache and root:
+            response_cache = ResponseCache(root)
+            resources.callback(response_cache.close)
+            enable_tool_cache_persistence(root)
+        out = output.open("wb") if output else sys.stdout.buffer
+        try:
+
+            def _write(result: dict) -> None:
+                out.write(dumps_line(result))
+                out.flush()
+
+            summary = run_batch(
+                bp,
+                iter_jsonl(inputs),
+                _write,
+                model_name=model,
+                generation_kwargs={"temperature": temperature, "top_p": top_p},
+                strip_think=strip_think,
+                concurrency=concurrency,
+                ordered=ordered,
+                cache=response_cache,
+            )
+        finally:
+            if output:
+                out.close()
+        tool_cache = tool_cache_stats()
+        if tool_cache:
+            summary["tool_cache"] = tool_cache
+        if http_cache:
+            summary["http_cache"] = http_cache_stats()
+        _add_pool_stats(summary)
+        # Keep stdout clean for the JSONL stream
+        Console(stderr=True).print(json.dumps(summary, ensure_ascii=False))
+
+
 @app.command()
 def init(
     name: str = typer.Argument(..., help="Blueprint name (slug will be derived)"),
@@ -130,9 +462,12 @@ def openapi(
     spec: Path = typer.Argument(..., exists=True, help="Path to OpenAPI spec (yaml/json)"),
     tag: str = typer.Option("api", "--tag", help="Prefix/tag for generated tools"),
     base_url: str = typer.Option(None, "--base-url", help="Override base URL from spec"),
+    cache_dir: Path = typer.Option(
+        None, "--cache-dir", help="Keep the compiled spec in this directory for later runs"
+    ),
 ):
     """Ingest a simple OpenAPI spec and register tools at runtime."""
-    registered = ingest_openapi(spec, tag=tag, base_url_override=base_url)
+    registered = ingest_openapi(spec, tag=tag, base_url_override=base_url, cache_dir=cache_dir)
     console.print(Panel.fit("[bold]OpenAPI Tools Registered[/bold]"))
     print(json.dumps(registered, indent=2))
 
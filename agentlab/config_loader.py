@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
 
-import yaml
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from . import __version__
+from .planner import plan_schedule, split_plan
+from .tracing import span
+from .utils.kvstore import SQLiteStore
+from .utils.yamlio import safe_load as yaml_safe_load
 
 
 class ToolRef(BaseModel):
@@ -17,6 +25,8 @@ class PlanStep(BaseModel):
     kind: Literal["tool_use", "generate", "note"] = Field(alias="step")
     name: Optional[str] = None  # tool name for tool_use or generator name for generate
     with_: Optional[Dict[str, Any]] = Field(default=None, alias="with")  # additional args
+    id: Optional[str] = None  # referenced by other steps' needs
+    needs: Optional[List[str]] = None  # ids this step waits for; None = the previous step
 
     model_config = {
         "populate_by_name": True,
@@ -34,6 +44,20 @@ class MemorySpec(BaseModel):
     strategy: Literal["none", "short_term", "episode"] = "short_term"
 
 
+class PromptBudget(BaseModel):
+    """Token budget for the whole generate prompt (estimated locally, see prompt_budget)."""
+
+    max_tokens: int = Field(gt=0)
+    per_entry_max_tokens: Optional[int] = Field(default=None, gt=0)  # cap for any one tool output
+    dedupe_lines: bool = True  # drop lines repeated across tool outputs
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_int(cls, data: Any) -> Any:
+        # Shorthand: `prompt_budget: 2000`
+        return {"max_tokens": data} if isinstance(data, int) else data
+
+
 class Blueprint(BaseModel):
     name: str
     description: str = ""
@@ -46,11 +70,96 @@ class Blueprint(BaseModel):
     memory: MemorySpec = MemorySpec()
     plan: List[PlanStep] = []
     evaluation: List[EvalCase] = []
-
-
-def load_blueprint(path: Path) -> Blueprint:
-    data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    prompt_budget: Optional[PromptBudget] = None
+
+    @model_validator(mode="after")
+    def _check_plan_dependencies(self) -> "Blueprint":
+        plan_schedule(split_plan(self.plan)[0])
+        return self
+
+
+# Validated blueprints by resolved path: (mtime_ns, size, content sha256, blueprint)
+_BLUEPRINT_MEMO: Dict[str, Tuple[int, int, str, Blueprint]] = {}
+# Disk entries are blueprint JSON; only reuse those written by the same schema version
+_DISK_CACHE_VERSION = __version__
+
+
+def load_blueprint(
+    path: Path, cache: bool = False, cache_dir: Union[str, Path, None] = None
+) -> Blueprint:
+    """Read, parse (libyaml when available) and validate a blueprint file.
+
+    With ``cache`` the validated blueprint is kept in memory, keyed by path, mtime and content
+    hash, so an unchanged file loads without reading it; callers then share one instance and
+    should treat it as read-only. ``cache_dir`` (implies ``cache``) also keeps validated
+    blueprints on disk, keyed by content hash, for short-lived processes such as the CLI.
+    """
+    with span("load_blueprint", path=str(path)) as sp:
+        use_cache = cache or cache_dir is not None
+        key = str(Path(path).resolve()) if use_cache else ""
+        memo = _BLUEPRINT_MEMO.get(key) if use_cache else None
+        if use_cache:
+            st = os.stat(path)
+            if memo is not None and memo[:2] == (st.st_mtime_ns, st.st_size):
+                if sp is not None:
+                    sp.attrs["cache"] = "memory"
+                return memo[3]
+        data = Path(path).read_bytes()
+        if sp is not None:
+            sp.attrs["bytes"] = len(data)
+        if not use_cache:
+            return _parse_blueprint(data)
+
+        digest = hashlib.sha256(data).hexdigest()
+        disk_key = f"{digest}:{_DISK_CACHE_VERSION}"
+        source = "memory"
+        bp = memo[3] if memo is not None and memo[2] == digest else None
+        store = _blueprint_store(cache_dir) if cache_dir is not None and bp is None else None
+        try:
+            if bp is None and store is not None:
+                bp = _from_json(_store_call(store.get, disk_key))
+                source = "disk"
+            if bp is None:
+                bp = _parse_blueprint(data)
+                source = "miss"
+                if store is not None:
+                    _store_call(store.set, disk_key, bp.model_dump_json(by_alias=True).encode())
+        finally:
+            if store is not None:
+                store.close()
+        _BLUEPRINT_MEMO[key] = (st.st_mtime_ns, st.st_size, digest, bp)
+        if sp is not None:
+            sp.attrs["cache"] = source
+        return bp
+
+
+def _parse_blueprint(data: bytes) -> Blueprint:
+    parsed = yaml_safe_load(data)
     try:
-        return Blueprint.model_validate(data)
+        return Blueprint.model_validate(parsed)
     except ValidationError as e:
         raise SystemExit(f"Invalid blueprint: {e}")
+
+
+def _from_json(raw: Optional[bytes]) -> Optional[Blueprint]:
+    if raw is None:
+        return None
+    try:
+        return Blueprint.model_validate_json(raw)
+    except ValidationError:
+        return None  # unreadable entry: parse again and overwrite it
+
+
+def _blueprint_store(cache_dir: Union[str, Path]) -> Optional[SQLiteStore]:
+    # The disk cache is an optimisation: an unusable cache directory means a normal parse
+    try:
+        return SQLiteStore(Path(cache_dir) / "blueprints.sqlite3", max_entries=1_000)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _store_call(fn: Callable[..., Any], *args: Any) -> Any:
+    try:
+        return fn(*args)
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+import orjson
+
+from .config_loader import Blueprint
+from .runner import render_tool_args
+from .utils.kvstore import DEFAULT_CACHE_DIR, SQLiteStore
+
+# Bump when the fingerprint material or the stored record changes shape
+_FINGERPRINT_VERSION = 1
+
+
+def case_fingerprint(
+    blueprint: Blueprint,
+    case_input: Any,
+    model_name: str,
+    generation_kwargs: Optional[Mapping[str, Any]] = None,
+    strip_think: bool = True,
+) -> str:
+    """Hash of everything that decides a case's output, short of what the tools return.
+
+    Covers the system prompt, plan, prompt budget, rendered tool arguments, model, generation
+    settings and the case input. Checks are deliberately left out so editing them reuses output.
+    """
+    material = {
+        "version": _FINGERPRINT_VERSION,
+        "system_prompt": blueprint.system_prompt,
+        "plan": [step.model_dump(by_alias=True, exclude_none=True) for step in blueprint.plan],
+        "prompt_budget": blueprint.prompt_budget.model_dump() if blueprint.prompt_budget else None,
+        "tool_args": render_tool_args(blueprint, case_input),
+        "model": model_name,
+        "kwargs": dict(generation_kwargs or {}),
+        "strip_think": strip_think,
+        "input": case_input,
+    }
+    return hashlib.sha256(
+        orjson.dumps(material, option=orjson.OPT_SORT_KEYS, default=str)
+    ).hexdigest()
+
+
+class EvalResultStore:
+    """On-disk outputs of evaluation cases keyed by case_fingerprint, for incremental evals."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_entries: Optional[int] = 50_000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+    ) -> None:
+        self._store = SQLiteStore(
+            Path(directory) / "eval_results.sqlite3", max_entries=max_entries, max_bytes=max_bytes
+        )
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self._store.get(fingerprint)
+        except (OSError, sqlite3.Error):
+            return None  # a busy or broken store is a miss, not a failed case
+        if raw is None:
+            return None
+        record: Dict[str, Any] = orjson.loads(raw)
+        return record
+
+    def set(self, fingerprint: str, output: str, duration_s: float) -> None:
+        try:
+            self._store.set(fingerprint, orjson.dumps({"output": output, "duration_s": duration_s}))
+        except (OSError, sqlite3.Error):
+            pass
+
+    def close(self) -> None:
+        self._store.close()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import glob
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .config_loader import load_blueprint
+from .evaluator import (
+    aggregate_llm_metrics,
+    merge_shard_summaries,
+    run_evaluations,
+    write_junit_suites,
+)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SuiteOptions:
+    """Per-blueprint evaluation settings shipped to worker processes."""
+
+    model_name: str = "qwen3:8b"
+    strip_think: bool = True
+    concurrency: int = 1  # cases generating at once within one blueprint
+    cache_dir: Optional[str] = None  # blueprint/spec caches; also response cache if cache
+    cache: bool = False
+    http_cache: bool = False
+    openapi_spec: Optional[str] = None
+    openapi_tag: str = "api"
+    openapi_base_url: Optional[str] = None
+    shard: Optional[Tuple[int, int]] = None  # (i, n): run only shard i of n of every blueprint
+    incremental: bool = False  # reuse stored outputs of unchanged cases (needs cache_dir)
+
+
+def resolve_blueprints(target: str) -> List[Path]:
+    """Blueprint files for a directory (its *.yaml/*.yml), a glob pattern, or a single file."""
+    path = Path(target)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.suffix.lower() in {".yaml", ".yml"})
+    if glob.has_magic(target):
+        return sorted(Path(p) for p in glob.glob(target, recursive=True) if Path(p).is_file())
+    return [path] if path.is_file() else []
+
+
+def evaluate_blueprint_file(path: str, options: SuiteOptions) -> Dict[str, Any]:
+    """Evaluate one blueprint file; failures to load or run are reported, not raised."""
+    # Imported here so worker processes only pay for what they use
+    from .eval_store import EvalResultStore
+    from .llm.cache import ResponseCache
+    from .llm.ollama_client import pool_stats
+    from .tools.memo import enable_tool_cache_persistence
+    from .tools.openapi.ingest import ingest_openapi
+    from .tools.runtime.http_cache import enable_http_cache, get_http_cache
+
+    started = time.perf_counter()
+    pool_before = pool_stats()
+    try:
+        # Caches only save work: one this worker cannot open (a busy or unwritable shared
+        # directory) is skipped rather than failing the blueprint
+        if options.http_cache and options.cache_dir and get_http_cache() is None:
+            _open_cache(enable_http_cache, options.cache_dir)
+        bp = load_blueprint(Path(path), cache_dir=options.cache_dir)
+        if options.openapi_spec:
+            ingest_openapi(
+                options.openapi_spec,
+                tag=options.openapi_tag,
+                base_url_override=options.openapi_base_url,
+                cache_dir=options.cache_dir,
+            )
+        if options.cache and options.cache_dir:
+            _open_cache(enable_tool_cache_persistence, options.cache_dir)
+        response_cache = (
+            _open_cache(ResponseCache, options.cache_dir)
+            if options.cache and options.cache_dir
+            else None
+        )
+        store = (
+            _open_cache(EvalResultStore, options.cache_dir)
+            if options.incremental and options.cache_dir
+            else None
+        )
+        try:
+            summary = run_evaluations(
+                bp,
+                options.model_name,
+                options.strip_think,
+                None,
+                response_cache,
+                options.concurrency,
+                options.shard,
+                store,
+            )
+        finally:
+            if response_cache is not None:
+                response_cache.close()
+            if store is not None:
+                store.close()
+    except (Exception, SystemExit) as e:
+        summary = {
+            "agent": Path(path).stem,
+            "total": 0,
+            "passed": 0,
+            "results": [],
+            "error": str(e),
+            "timing": {"wall_s": round(time.perf_counter() - started, 4), "cases_s": 0.0},
+        }
+        if options.shard is not None:
+            summary["shard"] = {"index": options.shard[0], "count": options.shard[1], "cases": 0}
+    pool_after = pool_stats()
+    if pool_after != pool_before:
+        # Per blueprint: a worker process evaluates several and its counters accumulate
+        summary["llm_pool"] = {k: pool_after[k] - pool_before[k] for k in ("hits", "misses")}
+    return {"path": str(path), **summary}
+
+
+def _open_cache(factory: Callable[[str], T], directory: str) -> Optional[T]:
+    try:
+        return factory(directory)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def run_evaluation_suite(
+    paths: List[Path],
+    options: SuiteOptions = SuiteOptions(),
+    workers: Optional[int] = None,
+    junit_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Evaluate many blueprints across ``workers`` processes and merge their summaries.
+
+    Each worker evaluates whole blueprints, running up to ``options.concurrency`` cases at once,
+    so LLM waits overlap both across and within blueprints. ``workers=1`` stays in-process.
+    Suites keep the order of ``paths``.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    started = time.perf_counter()
+    if workers == 1:
+        suites = [evaluate_blueprint_file(str(p), options) for p in paths]
+    else:
+        # Spawned workers start clean: no inherited event loops, pools or threads
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            suites = list(
+                pool.map(evaluate_blueprint_file, [str(p) for p in paths], [options] * len(paths))
+            )
+    wall = time.perf_counter() - started
+    summary = merge_suite_summaries(suites)
+    if options.incremental:
+        summary["incremental"] = _sum_stats(suites, "incremental")
+    summary["timing"] = {
+        "workers": workers,
+        "concurrency": max(1, options.concurrency),
+        "wall_s": round(wall, 4),
+        "suites_s": round(sum(s.get("timing", {}).get("wall_s", 0.0) for s in suites), 4),
+    }
+    if options.shard is not None:
+        summary["shard"] = {"index": options.shard[0], "count": options.shard[1]}
+    if junit_path:
+        write_junit_suites(junit_path, suites)
+    return summary
+
+
+def merge_suite_summaries(suites: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-blueprint summaries into totals plus the individual suites."""
+    summary: Dict[str, Any] = {
+        "blueprints": len(suites),
+        "total": sum(s.get("total", 0) for s in suites),
+        "passed": sum(s.get("passed", 0) for s in suites),
+        "errors": [{"path": s.get("path"), "error": s["error"]} for s in suites if s.get("error")],
+        "suites": suites,
+    }
+    llm = aggregate_llm_metrics([r for s in suites for r in s.get("results", [])])
+    if llm:
+        summary["llm"] = llm
+    pool = _sum_stats(suites, "llm_pool")
+    if pool:
+        summary["llm_pool"] = pool
+    return summary
+
+
+def merge_suite_shards(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine sharded run_evaluation_suite summaries, merging each blueprint's shards by path."""
+    by_path: Dict[str, List[Dict[str, Any]]] = {}
+    for part in parts:
+        for suite in part.get("suites", []):
+            by_path.setdefault(suite.get("path", suite.get("agent", "")), []).append(suite)
+    suites = [{"path": path, **merge_shard_summaries(group)} for path, group in by_path.items()]
+    summary = merge_suite_summaries(suites)
+    if any("incremental" in p for p in parts):
+        summary["incremental"] = _sum_stats(suites, "incremental")
+    timings = [p.get("timing", {}) for p in parts]
+    summary["timing"] = {
+        "workers": max((t.get("workers", 1) for t in timings), default=1),
+        "concurrency": max((t.get("concurrency", 1) for t in timings), default=1),
+        "wall_s": round(max((t.get("wall_s", 0.0) for t in timings), default=0.0), 4),
+        "suites_s": round(sum(t.get("suites_s", 0.0) for t in timings), 4),
+    }
+    return summary
+
+
+def _sum_stats(suites: List[Dict[str, Any]], key: str) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for suite in suites:
+        for k, v in suite.get(key, {}).items():
+            totals[k] = totals.get(k, 0) + v
+    return totals
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import re
-from typing import Any, Dict, List
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
 
-from .config_loader import Blueprint
-from .runner import run_agent
+import orjson
+
+from .config_loader import Blueprint, EvalCase
+from .eval_store import EvalResultStore, case_fingerprint
+from .llm.cache import ResponseCache
+from .runner import aclose_clients, arun_agent
 
 
 def _check_contains(output: str, needle: str) -> bool:
@@ -44,41 +52,97 @@ def _evaluate_checks(
     return False
 
 
-def run_evaluations(
+async def arun_evaluations(
     blueprint: Blueprint,
     model_name: str = "qwen3:8b",
     strip_think: bool = True,
     junit_path: str | None = None,
+    cache: ResponseCache | None = None,
+    concurrency: int = 1,
+    shard: Optional[Tuple[int, int]] = None,
+    store: EvalResultStore | None = None,
 ) -> Dict[str, Any]:
-    results: List[Dict[str, Any]] = []
-    passed = 0
-    for case in blueprint.evaluation:
-        extra: Dict[str, Any] = {"strip_think": strip_think}
-        outcome = run_agent(
-            blueprint,
-            input_text=case.input,
-            model_name=model_name,
-            **extra,
-        )
+    """Run every evaluation case on the current loop, at most ``concurrency`` at a time.
+
+    Results keep the blueprint's case order regardless of completion order; each carries its
+    ``case_index`` in the blueprint. The summary's ``timing`` block compares wall time with the
+    summed per-case time. With ``shard=(i, n)`` only the cases of shard i (1-based) of n run, and
+    the summary is a partial result for merge_shard_summaries. With ``store`` a case whose
+    fingerprint has a stored output is not generated again: its checks run on that output and
+    the result is marked ``reused``.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+    cases = list(enumerate(blueprint.evaluation))
+    if shard is not None:
+        cases = [(i, case) for i, case in cases if shard_of(case.input, shard[1]) == shard[0]]
+
+    async def _run_case(case_index: int, case: EvalCase) -> Dict[str, Any]:
+        fingerprint = stored = None
+        if store is not None:
+            fingerprint = case_fingerprint(blueprint, case.input, model_name, None, strip_think)
+            stored = store.get(fingerprint)
+        if stored is not None:
+            outcome: Dict[str, Any] = {"output": stored["output"]}
+            duration = 0.0
+        else:
+            async with sem:
+                started = time.perf_counter()
+                outcome = await arun_agent(
+                    blueprint,
+                    input_text=case.input,
+                    model_name=model_name,
+                    strip_think=strip_think,
+                    cache=cache,
+                )
+                duration = time.perf_counter() - started
         output = (outcome.get("output") or "").strip()
-        ok = _evaluate_checks(output, case.checks, case.expected)
-        results.append(
-            {
-                "input": case.input,
-                "expected_substring": case.expected,
-                "checks": case.checks,
-                "actual": output,
-                "pass": ok,
-            }
-        )
-        if ok:
-            passed += 1
-    summary = {
+        if store is not None and fingerprint is not None and stored is None:
+            store.set(fingerprint, output, round(duration, 4))
+        result = {
+            "case_index": case_index,
+            "input": case.input,
+            "expected_substring": case.expected,
+            "checks": case.checks,
+            "actual": output,
+            "pass": _evaluate_checks(output, case.checks, case.expected),
+            "duration_s": round(duration, 4),
+        }
+        if store is not None:
+            result["reused"] = stored is not None
+        if "llm" in outcome:
+            result["llm"] = outcome["llm"]
+        return result
+
+    wall_started = time.perf_counter()
+    results: List[Dict[str, Any]] = list(
+        await asyncio.gather(*(_run_case(i, case) for i, case in cases))
+    )
+    wall = time.perf_counter() - wall_started
+    summary: Dict[str, Any] = {
         "agent": blueprint.name,
-        "total": len(blueprint.evaluation),
-        "passed": passed,
+        "total": len(cases),
+        "passed": sum(1 for r in results if r["pass"]),
         "results": results,
+        "timing": {
+            "concurrency": max(1, concurrency),
+            "wall_s": round(wall, 4),
+            "cases_s": round(sum(r["duration_s"] for r in results), 4),
+        },
     }
+    llm = aggregate_llm_metrics(results)
+    if llm:
+        summary["llm"] = llm
+    if cache is not None:
+        summary["cache"] = cache.stats()
+    if store is not None:
+        reused = sum(1 for r in results if r["reused"])
+        summary["incremental"] = {"reused": reused, "rerun": len(results) - reused}
+    if shard is not None:
+        summary["shard"] = {
+            "index": shard[0],
+            "count": shard[1],
+            "cases": len(blueprint.evaluation),
+        }
     if junit_path:
         try:
             _write_junit(junit_path, blueprint.name, results)
@@ -87,19 +151,161 @@ def run_evaluations(
     return summary
 
 
-def _write_junit(path: str, suite_name: str, results: List[Dict[str, Any]]) -> None:
-    # Minimal JUnit XML
-    import xml.etree.ElementTree as ET
+def run_evaluations(
+    blueprint: Blueprint,
+    model_name: str = "qwen3:8b",
+    strip_think: bool = True,
+    junit_path: str | None = None,
+    cache: ResponseCache | None = None,
+    concurrency: int = 1,
+    shard: Optional[Tuple[int, int]] = None,
+    store: EvalResultStore | None = None,
+) -> Dict[str, Any]:
+    """Synchronous wrapper over arun_evaluations."""
+
+    async def _drive() -> Dict[str, Any]:
+        try:
+            return await arun_evaluations(
+                blueprint, model_name, strip_think, junit_path, cache, concurrency, shard, store
+            )
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(_drive())
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/n"`` (1-based shard i of n)."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/n, got {spec!r}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}, got {spec!r}")
+    return index, count
+
 
+def shard_of(case_input: Any, count: int) -> int:
+    """Stable 1-based shard of a case, from a hash of its input (same on every machine)."""
+    material = orjson.dumps(case_input, option=orjson.OPT_SORT_KEYS, default=str)
+    return int.from_bytes(hashlib.sha256(material).digest()[:8], "big") % count + 1
+
+
+def merge_shard_summaries(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine partial summaries of one blueprint's shards into a run_evaluations summary.
+
+    Raises ValueError when the parts disagree on agent, shard count or case count, a shard is
+    missing or repeated, or two parts report the same case.
+    """
+    if not parts:
+        raise ValueError("No shard results to merge")
+    agents = {p["agent"] for p in parts}
+    counts = {p.get("shard", {}).get("count") for p in parts}
+    cases = {p.get("shard", {}).get("cases") for p in parts}
+    if len(agents) != 1 or len(counts) != 1 or None in counts or len(cases) != 1:
+        raise ValueError(
+            f"Shard results do not belong together: agents={agents} counts={counts} cases={cases}"
+        )
+    (count,) = counts
+    indexes = sorted(p["shard"]["index"] for p in parts)
+    if indexes != list(range(1, count + 1)):
+        raise ValueError(f"Expected shards 1..{count}, got {indexes}")
+
+    results = sorted((r for p in parts for r in p["results"]), key=lambda r: r["case_index"])
+    case_indexes = [r["case_index"] for r in results]
+    if len(set(case_indexes)) != len(case_indexes):
+        raise ValueError("Shard results report the same case more than once")
+    timings = [p.get("timing", {}) for p in parts]
+    summary: Dict[str, Any] = {
+        "agent": parts[0]["agent"],
+        "total": len(results),
+        "passed": sum(1 for r in results if r["pass"]),
+        "results": results,
+        "timing": {
+            "concurrency": max(t.get("concurrency", 1) for t in timings),
+            # Shards run side by side, so the slowest one bounds the wall time
+            "wall_s": round(max(t.get("wall_s", 0.0) for t in timings), 4),
+            "cases_s": round(sum(r["duration_s"] for r in results), 4),
+        },
+    }
+    llm = aggregate_llm_metrics(results)
+    if llm:
+        summary["llm"] = llm
+    errors = [p["error"] for p in parts if p.get("error")]
+    if errors:
+        summary["error"] = "; ".join(dict.fromkeys(errors))
+    for key in ("cache", "incremental"):
+        stats = [p[key] for p in parts if key in p]
+        if stats:
+            summary[key] = {k: sum(s.get(k, 0) for s in stats) for k in stats[0]}
+    return summary
+
+
+def aggregate_llm_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Roll per-case Ollama metrics up into throughput, model-load and prompt-eval totals."""
+    metrics = [r["llm"] for r in results if r.get("llm")]
+    if not metrics:
+        return {}
+    eval_tokens = sum(m["eval_count"] for m in metrics)
+    eval_s = sum(m["eval_s"] for m in metrics)
+    return {
+        "cases": len(metrics),
+        "eval_tokens": eval_tokens,
+        "tokens_per_sec": round(eval_tokens / eval_s, 2) if eval_s else 0.0,
+        "prompt_tokens": sum(m["prompt_eval_count"] for m in metrics),
+        "prompt_tokens_max": max(m["prompt_eval_count"] for m in metrics),
+        "prompt_eval_s": round(sum(m["prompt_eval_s"] for m in metrics), 4),
+        "load_s": round(sum(m["load_s"] for m in metrics), 4),
+        "load_s_max": round(max(m["load_s"] for m in metrics), 4),
+    }
+
+
+def _junit_suite(suite_name: str, results: List[Dict[str, Any]]) -> "ET.Element":
     tests = len(results)
     failures = sum(1 for r in results if not r.get("pass"))
-    suite = ET.Element("testsuite", name=suite_name, tests=str(tests), failures=str(failures))
+    elapsed = sum(r.get("duration_s") or 0 for r in results)
+    suite = ET.Element(
+        "testsuite",
+        name=suite_name,
+        tests=str(tests),
+        failures=str(failures),
+        time=f"{elapsed:.3f}",
+    )
     for idx, r in enumerate(results, start=1):
-        case = ET.SubElement(suite, "testcase", name=f"case_{idx}")
+        # Name cases by blueprint position so shard reports line up with full runs
+        number = r["case_index"] + 1 if "case_index" in r else idx
+        case = ET.SubElement(
+            suite, "testcase", name=f"case_{number}", time=f"{r.get('duration_s') or 0:.3f}"
+        )
         if not r.get("pass"):
             fail = ET.SubElement(case, "failure", message="check_failed")
             fail.text = f"expected={r.get('expected_substring') or r.get('checks')} actual={r.get('actual')}"
-    tree = ET.ElementTree(suite)
+    return suite
+
+
+def _write_xml(path: str, root: "ET.Element") -> None:
+    tree = ET.ElementTree(root)
     if hasattr(ET, "indent"):
         ET.indent(tree)
     tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+def _write_junit(path: str, suite_name: str, results: List[Dict[str, Any]]) -> None:
+    # Minimal JUnit XML
+    _write_xml(path, _junit_suite(suite_name, results))
+
+
+def write_junit_suites(path: str, summaries: List[Dict[str, Any]]) -> None:
+    """Write one JUnit file with a ``testsuite`` per evaluation summary."""
+    root = ET.Element(
+        "testsuites",
+        tests=str(sum(s.get("total", 0) for s in summaries)),
+        failures=str(sum(s.get("total", 0) - s.get("passed", 0) for s in summaries)),
+    )
+    for summary in summaries:
+        suite = _junit_suite(summary.get("agent", ""), summary.get("results", []))
+        if summary.get("error"):
+            suite.set("errors", "1")
+            ET.SubElement(suite, "error", message="blueprint_error").text = summary["error"]
+        root.append(suite)
+    _write_xml(path, root)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+import orjson
+
+from ..utils.kvstore import DEFAULT_CACHE_DIR, SQLiteStore
+
+
+class ResponseCache:
+    """Opt-in on-disk cache of LLM responses keyed on (model, rendered prompt, generation kwargs).
+
+    Only worthwhile for deterministic generation (temperature 0), which is the default. Tracks
+    hits and misses for the lifetime of the instance.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self._store = SQLiteStore(
+            Path(directory) / "responses.sqlite3",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl=ttl,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, prompt: str, generation_kwargs: Optional[Mapping[str, Any]]) -> str:
+        material = {"model": model, "prompt": prompt, "kwargs": dict(generation_kwargs or {})}
+        return hashlib.sha256(
+            orjson.dumps(material, option=orjson.OPT_SORT_KEYS, default=str)
+        ).hexdigest()
+
+    def get(
+        self, model: str, prompt: str, generation_kwargs: Optional[Mapping[str, Any]]
+    ) -> Optional[str]:
+        try:
+            raw = self._store.get(self.key(model, prompt, generation_kwargs))
+        except sqlite3.Error:
+            raw = None  # a busy or broken store is a miss, not a failed generation
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return orjson.loads(raw)["text"]
+
+    def set(
+        self,
+        model: str,
+        prompt: str,
+        generation_kwargs: Optional[Mapping[str, Any]],
+        text: str,
+    ) -> None:
+        try:
+            self._store.set(
+                self.key(model, prompt, generation_kwargs), orjson.dumps({"text": text})
+            )
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._store.close()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, List
+
+import orjson
+
+
+class NDJSONDecoder:
+    """Incremental decoder for newline-delimited JSON over raw byte chunks.
+
+    Chunks may split a record anywhere (even inside a UTF-8 sequence); the partial tail is buffered
+    until its newline arrives. Complete lines are parsed straight out of the buffer with orjson,
+    so no intermediate str or Response objects are created per record. Malformed lines are
+    skipped and counted in ``errors``.
+    """
+
+    __slots__ = ("_buf", "errors")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self.errors = 0
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Consume a chunk and return every record completed by it."""
+        buf = self._buf
+        buf += data
+        records: List[Any] = []
+        start = 0
+        view = memoryview(buf)
+        try:
+            while True:
+                nl = buf.find(b"\n", start)
+                if nl == -1:
+                    break
+                if nl > start:
+                    self._decode(view[start:nl], records)
+                start = nl + 1
+        finally:
+            view.release()
+        if start:
+            del buf[:start]
+        return records
+
+    def close(self) -> List[Any]:
+        """Flush a trailing record that was not newline-terminated."""
+        records: List[Any] = []
+        if self._buf:
+            self._decode(bytes(self._buf), records)
+            self._buf.clear()
+        return records
+
+    def _decode(self, line: Any, records: List[Any]) -> None:
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            if bytes(line).strip():
+                self.errors += 1
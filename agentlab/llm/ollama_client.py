@@ -2,27 +2,251 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Any, Callable, Dict, Optional
+import time
+import weakref
+from dataclasses import asdict, dataclass, replace
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Union, overload
 
 import httpx
 
+from ..tracing import Span, span
+from .ndjson import NDJSONDecoder
+
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 TEST_MODE = os.getenv("AGENTLAB_TEST_MODE") == "1"
 DEFAULT_TEST_RESPONSE = "OK: test-mode response"
 
 
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection limits and per-phase timeouts (seconds) for the pooled Ollama client.
+
+    ``read_timeout`` is the max gap between received bytes; a non-streaming generation sends
+    nothing until it is done, so it bounds the whole generation there. ``first_token_timeout``
+    (streaming only) bounds the wait for response headers plus the first chunk, which is where a
+    cold model load shows up.
+    """
+
+    max_connections: int = 16
+    max_keepalive_connections: int = 8
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 10.0
+    first_token_timeout: Optional[float] = None
+
+
+_POOL_CONFIG = PoolConfig()
+# AsyncClient connections are bound to the loop that opened them, so keep one client per loop
+_POOL: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_POOL_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def configure_pool(**overrides: Any) -> PoolConfig:
+    """Update the pool configuration; applies to clients created after the call."""
+    global _POOL_CONFIG
+    _POOL_CONFIG = replace(_POOL_CONFIG, **overrides)
+    return _POOL_CONFIG
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _POOL.get(loop)
+    if client is not None and not client.is_closed:
+        _POOL_STATS["hits"] += 1
+        return client
+    _POOL_STATS["misses"] += 1
+    cfg = _POOL_CONFIG
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=cfg.max_connections,
+            max_keepalive_connections=cfg.max_keepalive_connections,
+            keepalive_expiry=cfg.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=cfg.connect_timeout,
+            read=cfg.read_timeout,
+            write=cfg.write_timeout,
+            pool=cfg.pool_timeout,
+        ),
+    )
+    _POOL[loop] = client
+    return client
+
+
+async def aclose_pool() -> None:
+    """Close the pooled client bound to the running event loop (no-op if none)."""
+    client = _POOL.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def pool_stats() -> Dict[str, int]:
+    """Pool hits/misses since process start plus the number of open pooled clients."""
+    open_clients = sum(1 for c in list(_POOL.values()) if not c.is_closed)
+    return {**_POOL_STATS, "open": open_clients}
+
+
+async def _aiter_chunks(resp: httpx.Response, deadline: Optional[float]) -> AsyncIterator[bytes]:
+    chunks = resp.aiter_bytes()
+    if deadline is not None:
+        try:
+            first = await asyncio.wait_for(
+                chunks.__anext__(), max(deadline - asyncio.get_running_loop().time(), 0)
+            )
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            raise httpx.ReadTimeout(
+                "No token received before first_token_timeout", request=resp.request
+            ) from None
+        yield first
+    async for chunk in chunks:
+        yield chunk
+
+
+def _consume(
+    records: List[Any], full: List[str], on_token: Optional[Callable[[str], None]]
+) -> Optional[Dict[str, Any]]:
+    """Append streamed tokens to full; return the final ``done`` record if present."""
+    final = None
+    for obj in records:
+        if not isinstance(obj, dict):
+            continue
+        token = obj.get("response")
+        if token:
+            full.append(token)
+            if on_token:
+                on_token(token)
+        if obj.get("done"):
+            final = obj
+    return final
+
+
+@dataclass(frozen=True)
+class GenerationMetrics:
+    """Token counts and timings from Ollama's final record (durations converted to seconds)."""
+
+    prompt_eval_count: int = 0
+    prompt_eval_s: float = 0.0
+    eval_count: int = 0
+    eval_s: float = 0.0
+    load_s: float = 0.0
+    total_s: float = 0.0
+
+    @classmethod
+    def from_ollama(cls, record: Dict[str, Any]) -> "GenerationMetrics":
+        def _secs(key: str) -> float:
+            return float(record.get(key) or 0) / 1e9
+
+        return cls(
+            prompt_eval_count=int(record.get("prompt_eval_count") or 0),
+            prompt_eval_s=_secs("prompt_eval_duration"),
+            eval_count=int(record.get("eval_count") or 0),
+            eval_s=_secs("eval_duration"),
+            load_s=_secs("load_duration"),
+            total_s=_secs("total_duration"),
+        )
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.eval_count / self.eval_s if self.eval_s else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "tokens_per_sec": round(self.tokens_per_sec, 2)}
+
+
+@dataclass(frozen=True)
+class Completion:
+    """Structured acomplete result: the text plus metrics when Ollama reported them."""
+
+    text: str
+    metrics: Optional[GenerationMetrics] = None
+
+
+@overload
+async def acomplete(
+    prompt: str,
+    model: str = ...,
+    stream: bool = ...,
+    client: Optional[httpx.AsyncClient] = ...,
+    on_token: Optional[Callable[[str], None]] = ...,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = ...,
+    *,
+    return_result: Literal[False] = ...,
+    **kwargs: Any,
+) -> str: ...
+
+
+@overload
+async def acomplete(
+    prompt: str,
+    model: str = ...,
+    stream: bool = ...,
+    client: Optional[httpx.AsyncClient] = ...,
+    on_token: Optional[Callable[[str], None]] = ...,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = ...,
+    *,
+    return_result: Literal[True],
+    **kwargs: Any,
+) -> Completion: ...
+
+
 async def acomplete(
     prompt: str,
     model: str = "qwen3:8b",
     stream: bool = False,
     client: Optional[httpx.AsyncClient] = None,
     on_token: Optional[Callable[[str], None]] = None,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    *,
+    return_result: bool = False,
     **kwargs: Any,
-) -> str:
+) -> Union[str, Completion]:
+    """Generate a completion for prompt; returns the full response text.
+
+    When streaming, ``on_token`` receives each fragment as it arrives. ``on_done`` receives
+    Ollama's final record (the one with ``done: true``, carrying eval counts and durations).
+    With ``return_result`` a Completion carrying GenerationMetrics is returned instead of str.
+    """
     if TEST_MODE:
-        return DEFAULT_TEST_RESPONSE
+        return Completion(DEFAULT_TEST_RESPONSE) if return_result else DEFAULT_TEST_RESPONSE
+
+    final: List[Dict[str, Any]] = []
 
+    def _done(record: Dict[str, Any]) -> None:
+        final.append(record)
+        if on_done:
+            on_done(record)
+
+    with span(
+        "llm.generate", model=model, stream=bool(stream), prompt_bytes=len(prompt.encode())
+    ) as sp:
+        text = await _agenerate(prompt, model, stream, client, on_token, _done, sp, kwargs)
+        metrics = GenerationMetrics.from_ollama(final[-1]) if final else None
+        if sp is not None:
+            sp.attrs["response_bytes"] = len(text.encode())
+            if metrics is not None:
+                sp.attrs.update(eval_count=metrics.eval_count, load_s=metrics.load_s)
+    return Completion(text, metrics) if return_result else text
+
+
+async def _agenerate(
+    prompt: str,
+    model: str,
+    stream: bool,
+    client: Optional[httpx.AsyncClient],
+    on_token: Optional[Callable[[str], None]],
+    on_done: Callable[[Dict[str, Any]], None],
+    sp: Optional[Span],
+    kwargs: Dict[str, Any],
+) -> str:
     payload: Dict[str, Any] = {
         "model": model,
         "prompt": prompt,
@@ -31,38 +255,54 @@ async def acomplete(
         "top_p": 1,
     }
     payload.update(kwargs)
-    _client = client or httpx.AsyncClient(timeout=60)
-    try:
-        if stream:
-            async with _client.stream("POST", f"{OLLAMA_URL}/api/generate", json=payload) as resp:
-                resp.raise_for_status()
-                full = []
-                async for chunk in resp.aiter_text():
-                    if not chunk:
-                        continue
-                    # Each line is a JSON object from Ollama when streaming
-                    for line in chunk.splitlines():
-                        if not line.strip():
-                            continue
-                        try:
-                            obj = httpx.Response(200, text=line).json()
-                        except Exception:
-                            # Fallback if parsing fails; emit raw
-                            if on_token:
-                                on_token(line)
-                            full.append(line)
-                            continue
-                        token = obj.get("response", "")
-                        if token and on_token:
-                            on_token(token)
-                        if token:
-                            full.append(token)
-                return "".join(full)
+    _client = client or get_client()
+    if stream:
+        cfg = _POOL_CONFIG
+        timeout = None
+        deadline = None
+        if cfg.first_token_timeout is not None:
+            # Let the deadline below, not the per-read timeout, govern a slow model load
+            timeout = httpx.Timeout(
+                connect=cfg.connect_timeout,
+                read=max(cfg.read_timeout, cfg.first_token_timeout),
+                write=cfg.write_timeout,
+                pool=cfg.pool_timeout,
+            )
+            deadline = asyncio.get_running_loop().time() + cfg.first_token_timeout
+        request = _client.build_request(
+            "POST",
+            f"{OLLAMA_URL}/api/generate",
+            json=payload,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        send = _client.send(request, stream=True)
+        if deadline is not None:
+            try:
+                resp = await asyncio.wait_for(send, cfg.first_token_timeout)
+            except asyncio.TimeoutError:
+                raise httpx.ReadTimeout(
+                    "No response before first_token_timeout", request=request
+                ) from None
         else:
-            resp = await _client.post(f"{OLLAMA_URL}/api/generate", json=payload)
+            resp = await send
+        try:
             resp.raise_for_status()
-            data = resp.json()
-            return data.get("response", "")
-    finally:
-        if client is None:
-            await _client.aclose()
+            full: List[str] = []
+            decoder = NDJSONDecoder()
+            final: Optional[Dict[str, Any]] = None
+            async for chunk in _aiter_chunks(resp, deadline):
+                final = _consume(decoder.feed(chunk), full, on_token) or final
+                if sp is not None and full and "ttft_ms" not in sp.attrs:
+                    sp.attrs["ttft_ms"] = round((time.perf_counter() - sp.start) * 1000, 3)
+            final = _consume(decoder.close(), full, on_token) or final
+            if final is not None:
+                on_done(final)
+            return "".join(full)
+        finally:
+            await resp.aclose()
+    else:
+        resp = await _client.post(f"{OLLAMA_URL}/api/generate", json=payload)
+        resp.raise_for_status()
+        data = resp.json()
+        on_done(data)
+        return data.get("response", "")
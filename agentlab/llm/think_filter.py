@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import List
+
+_OPEN = "<think>"
+_CLOSE = "</think>"
+
+
+def _partial_tag_len(text: str, tag: str) -> int:
+    """Length of the longest suffix of text that is a proper prefix of tag."""
+    for n in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:n]):
+            return n
+    return 0
+
+
+class ThinkFilter:
+    """Incremental ``<think>...</think>`` remover for streamed model output.
+
+    ``feed`` takes fragments as they arrive and returns the text that is safe to show now; tags
+    split across fragments are held back until they can be decided. ``flush`` returns whatever
+    remains at the end. The concatenated output equals the non-streaming result: think spans
+    removed, an unterminated ``<think>`` left as is, and (with ``strip``) surrounding whitespace
+    trimmed.
+    """
+
+    def __init__(self, strip: bool = True) -> None:
+        self.strip = strip
+        self._buf = ""  # undecided text: a partial tag, or the body of an open think span
+        self._inside = False
+        self._started = False  # visible text emitted yet (leading whitespace is dropped)
+        self._pending_ws = ""  # trailing whitespace held back until more text follows
+
+    def feed(self, fragment: str) -> str:
+        self._buf += fragment
+        out: List[str] = []
+        while self._buf:
+            if self._inside:
+                end = self._buf.find(_CLOSE)
+                if end < 0:
+                    break  # keep the span body: dropped once closed, shown if never closed
+                self._buf = self._buf[end + len(_CLOSE) :]
+                self._inside = False
+                continue
+            start = self._buf.find(_OPEN)
+            if start >= 0:
+                out.append(self._buf[:start])
+                self._buf = self._buf[start + len(_OPEN) :]
+                self._inside = True
+                continue
+            keep = _partial_tag_len(self._buf, _OPEN)
+            out.append(self._buf[: len(self._buf) - keep])
+            self._buf = self._buf[len(self._buf) - keep :]
+            break
+        return self._visible("".join(out))
+
+    def flush(self) -> str:
+        rest = (_OPEN + self._buf) if self._inside else self._buf
+        self._buf, self._inside = "", False
+        text = self._visible(rest)
+        self._pending_ws = ""  # trailing whitespace is trimmed
+        return text
+
+    def _visible(self, text: str) -> str:
+        if not self.strip or not text:
+            return text
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        text = self._pending_ws + text
+        body = text.rstrip()
+        self._pending_ws = text[len(body) :]
+        return body
@@ -4,14 +4,18 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+from agentlab.tools.base import tool
+
 # Add simple deterministic mocks to keep agent runs testable
 
 
+@tool(cacheable=True)
 def internalSearch(query: str) -> str:
     # In real life, this would hit a vector store. For now, return a canned snippet.
     return f"[mock-internalSearch] top_result: Related info for: {query[:80]}"
 
 
+@tool(cacheable=True)
 def summarize(text: str) -> str:
     # A fake summarizer we can call as a tool (distinct from LLM generate step)
     return "[mock-summarize] " + (text[:160] + ("…" if len(text) > 160 else ""))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .config_loader import PlanStep
+
+
+def split_plan(steps: Sequence["PlanStep"]) -> Tuple[List["PlanStep"], Optional["PlanStep"]]:
+    """Return the steps that run before the first generate step, and that generate step."""
+    for idx, step in enumerate(steps):
+        if step.kind == "generate":
+            return list(steps[:idx]), step
+    return list(steps), None
+
+
+def plan_schedule(steps: Sequence["PlanStep"]) -> List[Tuple[int, List[int]]]:
+    """Resolve step dependencies into a deterministic topological order.
+
+    A step without ``needs`` depends on the step right before it (today's sequential
+    semantics); ``needs`` lists the ids it waits for instead (``[]`` means none). Returns
+    ``(index, dependency_indices)`` pairs, ready steps ordered by plan position. Raises
+    ValueError on duplicate ids, unknown ids or cycles.
+    """
+    ids: Dict[str, int] = {}
+    for idx, step in enumerate(steps):
+        if step.id is None:
+            continue
+        if step.id in ids:
+            raise ValueError(f"Duplicate plan step id: {step.id!r}")
+        ids[step.id] = idx
+
+    deps: List[List[int]] = []
+    for idx, step in enumerate(steps):
+        if step.needs is None:
+            deps.append([idx - 1] if idx else [])
+            continue
+        resolved = []
+        for need in step.needs:
+            if need not in ids:
+                raise ValueError(f"Plan step {step.id or idx!r} needs unknown step id {need!r}")
+            resolved.append(ids[need])
+        deps.append(sorted(set(resolved)))
+
+    dependents: List[List[int]] = [[] for _ in steps]
+    remaining = [len(d) for d in deps]
+    for idx, ds in enumerate(deps):
+        for d in ds:
+            dependents[d].append(idx)
+    ready = [idx for idx, n in enumerate(remaining) if n == 0]
+    heapq.heapify(ready)
+    order: List[Tuple[int, List[int]]] = []
+    while ready:
+        idx = heapq.heappop(ready)
+        order.append((idx, deps[idx]))
+        for nxt in dependents[idx]:
+            remaining[nxt] -= 1
+            if remaining[nxt] == 0:
+                heapq.heappush(ready, nxt)
+    if len(order) != len(steps):
+        stuck = [steps[i].id or str(i) for i, n in enumerate(remaining) if n]
+        raise ValueError(f"Plan step dependencies form a cycle: {', '.join(stuck)}")
+    return order
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# Estimated cost of the " …[+N tokens]" marker left where text was cut
+_MARKER_TOKENS = 6
+
+# Lines shorter than this, without letters/digits (e.g. "{", "},", "]") or opening a block
+# ('"tags": [') are never deduped: they are structure, and dropping them would unbalance JSON or
+# code in the tool output
+_MIN_DEDUPE_CHARS = 8
+
+# Words, digit runs and single symbols: roughly how BPE tokenizers split English text and code
+_TOKEN_PIECE = re.compile(r"[^\W\d_]+|\d+|\S")
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate: one token per short word/number/symbol, long words per ~6 chars.
+
+    Usually within ~20% of real tokenizers for English prose, JSON and code; no network or
+    tokenizer files needed.
+    """
+    count = 0
+    for match in _TOKEN_PIECE.finditer(text):
+        count += 1 + (match.end() - match.start() - 1) // 6
+    return count
+
+
+@dataclass
+class CompactionStats:
+    """What compaction removed from the tool context to fit the prompt budget."""
+
+    prompt_tokens: int = 0
+    dropped_tokens: int = 0
+    dropped_bytes: int = 0
+    deduped_lines: int = 0
+    compacted_entries: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens estimated tokens, marking what was dropped."""
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text
+    limit = max_tokens - _MARKER_TOKENS
+    if limit <= 0:
+        return ""
+    # Start from the proportional cut point and back off until the estimate fits
+    end = len(text) * limit // total
+    while end > 0 and estimate_tokens(text[:end]) > limit:
+        end = end * 9 // 10
+    kept = text[:end].rstrip()
+    return f"{kept} …[+{total - estimate_tokens(kept)} tokens]"
+
+
+def dedupe_lines(entries: Sequence[str]) -> Tuple[List[str], int]:
+    """Drop lines already seen in an earlier entry (or earlier in the same one).
+
+    The first line of every entry carries the tool label and is always kept, as are short and
+    punctuation-only lines.
+    """
+    seen: Set[str] = set()
+    out: List[str] = []
+    removed = 0
+    for entry in entries:
+        head, *rest = entry.split("\n")
+        kept = [head]
+        seen.add(head.strip())
+        for line in rest:
+            key = line.strip()
+            if not _dedupable(key):
+                kept.append(line)
+                continue
+            if key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+            kept.append(line)
+        out.append("\n".join(kept))
+    return out, removed
+
+
+def _dedupable(line: str) -> bool:
+    return (
+        len(line) >= _MIN_DEDUPE_CHARS
+        and not line.endswith(("{", "[", "("))
+        and any(ch.isalnum() for ch in line)
+    )
+
+
+def compact_entries(
+    entries: Sequence[str],
+    available_tokens: int,
+    per_entry_max_tokens: Optional[int] = None,
+    dedupe: bool = True,
+) -> Tuple[List[str], CompactionStats]:
+    """Fit tool context entries into available_tokens.
+
+    Each entry is cut to ``per_entry_max_tokens`` when given. Only if the total exceeds the budget
+    are repeated lines removed and every entry cut to its share of ``available_tokens``,
+    proportional to its size; context that already fits is left untouched. Entries are kept in
+    order.
+    """
+    stats = CompactionStats()
+    original_bytes = sum(len(e.encode()) for e in entries)
+    original_tokens = sum(estimate_tokens(e) for e in entries)
+    out = list(entries)
+    if dedupe and original_tokens > available_tokens:
+        out, stats.deduped_lines = dedupe_lines(out)
+    if per_entry_max_tokens is not None:
+        out = [truncate_to_tokens(e, per_entry_max_tokens) for e in out]
+    sizes = [estimate_tokens(e) for e in out]
+    total = sum(sizes)
+    if total > available_tokens:
+        budget = max(available_tokens, 0)
+        out = [truncate_to_tokens(e, budget * size // total) for e, size in zip(out, sizes)]
+    stats.compacted_entries = sum(1 for before, after in zip(entries, out) if after != before)
+    stats.dropped_bytes = max(original_bytes - sum(len(e.encode()) for e in out), 0)
+    stats.dropped_tokens = max(original_tokens - sum(estimate_tokens(e) for e in out), 0)
+    return [e for e in out if e], stats
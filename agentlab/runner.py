@@ -3,15 +3,40 @@
 from __future__ import annotations
 
 import asyncio
-import re
-from typing import Any, Dict, List, Optional, Union
+import inspect
+import time
+import weakref
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
+import httpx
 import orjson
 
-from .config_loader import Blueprint
-from .llm.ollama_client import acomplete
-from .tools.registry import get_tool, load_default_tools, load_plugin_tools
-from .utils.templates import render_mapping
+from .config_loader import Blueprint, PlanStep
+from .llm.cache import ResponseCache
+from .llm.ollama_client import Completion, GenerationMetrics, aclose_pool, acomplete
+from .llm.think_filter import ThinkFilter
+from .planner import plan_schedule, split_plan
+from .prompt_budget import CompactionStats, compact_entries, estimate_tokens
+from .tools.executor import (
+    is_picklable,
+    run_in_daemon_thread,
+    run_in_tool_process,
+    run_in_tool_thread,
+    terminate_process_pool,
+)
+from .tools.memo import TOOL_MEMO
+from .tools.registry import (
+    get_async_tool,
+    get_tool,
+    get_tool_options,
+    load_default_tools,
+    load_plugin_tools,
+)
+from .tools.runtime.http_tool import aclose_http_clients, close_http_clients
+from .tracing import Tracer, current_tracer, span, trace
+from .utils.jsonl import InvalidLine
+from .utils.templates import CompiledMapping, compile_mapping, render_template
 
 
 def _render_prompt(system: str, user: str, tool_context: str | None = None) -> str:
@@ -22,107 +47,521 @@ def _render_prompt(system: str, user: str, tool_context: str | None = None) -> s
     return "\n\n".join(parts)
 
 
-def _execute_tool(name: str, args: Dict[str, Any] | None) -> str:
-    # Ensure default tools are available
-    load_default_tools()
+def _budgeted_prompt(
+    blueprint: Blueprint, user: str, tool_contexts: List[str]
+) -> Tuple[str, Optional[CompactionStats]]:
+    """Render the generate prompt, compacting tool contexts to the blueprint's prompt budget."""
+    budget = blueprint.prompt_budget
+    if budget is None or not tool_contexts:
+        tool_context = "\n".join(tool_contexts) if tool_contexts else None
+        return _render_prompt(blueprint.system_prompt, user, tool_context), None
+    with span("compact_prompt", max_tokens=budget.max_tokens) as sp:
+        # Whatever the system prompt, input and markup leave over goes to the tools
+        overhead = estimate_tokens(_render_prompt(blueprint.system_prompt, user, "\n"))
+        entries, stats = compact_entries(
+            tool_contexts,
+            budget.max_tokens - overhead,
+            per_entry_max_tokens=budget.per_entry_max_tokens,
+            dedupe=budget.dedupe_lines,
+        )
+        prompt = _render_prompt(blueprint.system_prompt, user, "\n".join(entries) or None)
+        stats.prompt_tokens = estimate_tokens(prompt)
+        if sp is not None:
+            sp.attrs.update(stats.as_dict())
+        return prompt, stats
+
+
+async def aclose_clients() -> None:
+    """Close the LLM and API clients pooled on the running loop (end of a run or batch)."""
+    await aclose_pool()
+    await aclose_http_clients()
+
+
+async def _aexecute_tool(name: str, args: Dict[str, Any] | None) -> str:
+    with span("tool", tool=name) as sp:
+        options = get_tool_options(name)
+        memoized = TOOL_MEMO.get(name, args, options) if options.cacheable else None
+        if memoized is not None:
+            output = memoized
+        else:
+            output = await _acall_tool(name, args)
+            if options.cacheable and not output.startswith("[tool-error]"):
+                TOOL_MEMO.set(name, args, options, output)
+        if sp is not None:
+            sp.attrs["memoized"] = memoized is not None
+            sp.attrs["args_bytes"] = len(orjson.dumps(args or {}, default=str))
+            sp.attrs["output_bytes"] = len(output.encode())
+        return output
+
+
+async def _acall_tool(name: str, args: Dict[str, Any] | None) -> str:
+    """Call a tool within its timeout: async tools on the loop, sync tools in the tool pool."""
     fn = get_tool(name)
     if not fn:
         return f"[tool-error] Unknown tool: {name}"
-    args = args or {}
+    timeout = get_tool_options(name).timeout
     try:
-        return str(fn(**args))
+        return await asyncio.wait_for(_ainvoke_tool(name, fn, args or {}), timeout)
+    except asyncio.TimeoutError:
+        return f"[tool-error] Tool timed out after {timeout:g}s: {name}"
+
+
+async def _ainvoke_tool(name: str, fn: Callable[..., Any], args: Dict[str, Any]) -> str:
+    acall = get_async_tool(name)
+    if acall is not None:
+        try:
+            return str(await acall(**args))
+        except TypeError:
+            if "input" in args:
+                return str(await acall(args["input"]))
+            return f"[tool-error] Bad arguments for tool: {name}"
+    if get_tool_options(name).cpu_bound and is_picklable(fn, args):
+        with span("tool.process", tool=name):
+            try:
+                return await run_in_tool_process(_call_in_process, name, fn, args)
+            except asyncio.CancelledError:
+                # Timed out or cancelled: the worker would keep running and block exit
+                terminate_process_pool()
+                raise
+    # A sync tool with a timeout may be abandoned mid-call; its own daemon thread keeps a hung
+    # call from holding up interpreter exit the way a pool thread would
+    timed = get_tool_options(name).timeout is not None
+    result = await (run_in_daemon_thread if timed else run_in_tool_thread)(_call_tool, name, args)
+    if inspect.isawaitable(result):
+        # A sync callable handing back a coroutine (e.g. a lambda wrapping an async def)
+        result = str(await result)
+    return result
+
+
+def _call_tool(name: str, args: Dict[str, Any] | None) -> Any:
+    fn = get_tool(name)
+    if not fn:
+        return f"[tool-error] Unknown tool: {name}"
+    return _call_fn(name, fn, args or {})
+
+
+def _call_fn(name: str, fn: Callable[..., Any], args: Dict[str, Any]) -> Any:
+    try:
+        result = fn(**args)
     except TypeError:
         # Fallback: pass single 'input' param if available
         if "input" in args:
-            return str(fn(args["input"]))
-        return f"[tool-error] Bad arguments for tool: {name}"
+            result = fn(args["input"])
+        else:
+            return f"[tool-error] Bad arguments for tool: {name}"
+    return result if inspect.isawaitable(result) else str(result)
 
 
-def run_agent(
+def _call_in_process(name: str, fn: Callable[..., Any], args: Dict[str, Any]) -> str:
+    """Worker-process entry point for CPU-bound tools; returns the output as a plain str."""
+    return str(_call_fn(name, fn, args))
+
+
+# Compiled with: mappings per plan step, reused across runs of the same blueprint
+_COMPILED_ARGS: Dict[int, Tuple["weakref.ref[PlanStep]", CompiledMapping]] = {}
+
+
+def _forget_compiled(key: int, ref: "weakref.ref[PlanStep]") -> None:
+    entry = _COMPILED_ARGS.get(key)
+    if entry is not None and entry[0] is ref:
+        del _COMPILED_ARGS[key]
+
+
+def _render_step_args(
+    step: PlanStep, variables: Dict[str, Any], user_input_str: str
+) -> Dict[str, Any]:
+    if not step.with_:
+        return {"input": render_template(user_input_str, variables)}
+    key = id(step)
+    entry = _COMPILED_ARGS.get(key)
+    if entry is None or entry[0]() is not step or entry[1].source is not step.with_:
+        ref = weakref.ref(step, lambda r: _forget_compiled(key, r))
+        entry = (ref, compile_mapping(step.with_))
+        _COMPILED_ARGS[key] = entry
+    return entry[1].render(variables)
+
+
+def _input_variables(
+    input_text: Optional[Union[str, Dict[str, Any]]],
+) -> Tuple[Dict[str, Any], str]:
+    # Normalize input for templating and user prompt
+    if isinstance(input_text, dict):
+        try:
+            return input_text, orjson.dumps(input_text).decode()
+        except Exception:
+            return input_text, str(input_text)
+    return {"input": input_text or ""}, input_text or ""
+
+
+def render_tool_args(
+    blueprint: Blueprint, input_text: Optional[Union[str, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Arguments each tool_use step of the plan would be called with, in plan order."""
+    variables, user_input_str = _input_variables(input_text)
+    steps, _ = split_plan(blueprint.plan)
+    return [
+        _render_step_args(step, variables, user_input_str)
+        for step in steps
+        if step.kind == "tool_use"
+    ]
+
+
+async def _run_steps(
+    steps: List[PlanStep], variables: Dict[str, Any], user_input_str: str
+) -> List[str]:
+    """Execute pre-generate steps as a dependency DAG; context entries keep plan order.
+
+    Independent tool steps run concurrently (async tools on the loop, sync tools in worker
+    threads), each starting as soon as the steps it needs have finished.
+    """
+    contexts: List[str] = [""] * len(steps)
+    tasks: Dict[int, asyncio.Future[None]] = {}
+
+    async def _run(idx: int, deps: List[int]) -> None:
+        if deps:
+            await asyncio.gather(*(tasks[d] for d in deps))
+        step = steps[idx]
+        if step.kind == "tool_use":
+            rendered_args = _render_step_args(step, variables, user_input_str)
+            output = await _aexecute_tool(step.name or "", rendered_args)
+            label = step.name or "tool"
+            args_str = (
+                " ".join(f"{k}={v}" for k, v in rendered_args.items()) if rendered_args else ""
+            )
+            contexts[idx] = f"[{label}{(' ' + args_str) if args_str else ''}] {output}"
+        else:
+            contexts[idx] = f"[note] {step.with_ or ''}"
+
+    for idx, deps in plan_schedule(steps):
+        tasks[idx] = asyncio.ensure_future(_run(idx, deps))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return contexts
+
+
+async def arun_agent(
     blueprint: Blueprint,
     input_text: Optional[Union[str, Dict[str, Any]]] = None,
     model_name: str = "qwen3:8b",
     stream: bool = False,
     generation_kwargs: Optional[Dict[str, Any]] = None,
     strip_think: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[ResponseCache] = None,
+    timings: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-    """Execute the plan with simple semantics: tool_use steps populate tool_context; generate creates final answer."""
-    tool_contexts: List[str] = []
-    # Normalize input for templating and user prompt
-    if isinstance(input_text, dict):
-        variables: Dict[str, Any] = input_text
-        try:
-            user_input_str = orjson.dumps(input_text).decode()
-        except Exception:
-            user_input_str = str(input_text)
-    else:
-        variables = {"input": input_text or ""}
-        user_input_str = input_text or ""
+    """Async-native run_agent for callers that already own an event loop.
+
+    Pass ``client`` to use your own connection pool; otherwise generations reuse the process-wide
+    pooled client bound to the running loop. With ``cache`` the generation is looked up by
+    (model, rendered prompt, generation kwargs) first and the result reports ``cached``. With
+    ``timings`` the result carries a per-span breakdown of where the run spent its time. When
+    streaming, ``on_token`` receives visible text as it arrives (think spans already removed if
+    ``strip_think``) and the result reports ``first_visible_token_ms`` since the run started.
+    """
+    active = current_tracer()
+    tracing = trace(active or Tracer()) if timings else nullcontext(active)
+    with tracing as tracer, span("run_agent", agent=blueprint.name) as root:
+        result = await _arun_plan(
+            blueprint,
+            input_text,
+            model_name,
+            stream,
+            generation_kwargs,
+            strip_think,
+            client,
+            cache,
+            on_token,
+        )
+    if timings and tracer is not None and root is not None:
+        result["timings"] = tracer.timings(root)
+    return result
+
+
+async def _arun_plan(
+    blueprint: Blueprint,
+    input_text: Optional[Union[str, Dict[str, Any]]],
+    model_name: str,
+    stream: bool,
+    generation_kwargs: Optional[Dict[str, Any]],
+    strip_think: bool,
+    client: Optional[httpx.AsyncClient],
+    cache: Optional[ResponseCache],
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    variables, user_input_str = _input_variables(input_text)
 
-    # Load plugin tools once per run
+    # Built-in and plugin tools are discovered once per process
+    load_default_tools()
     try:
         load_plugin_tools()
     except Exception:
         pass
 
-    for step in blueprint.plan:
-        if step.kind == "tool_use":
-            rendered_args = render_mapping(step.with_ or {"input": user_input_str}, variables)
-            output = _execute_tool(step.name or "", rendered_args)
-            label = step.name or "tool"
-            args_str = (
-                " ".join(f"{k}={v}" for k, v in rendered_args.items()) if rendered_args else ""
-            )
-            tool_contexts.append(f"[{label}{(' ' + args_str) if args_str else ''}] {output}")
-        elif step.kind == "note":
-            tool_contexts.append(f"[note] {step.with_ or ''}")
-        elif step.kind == "generate":
-            # Single LLM generation; include prior tool contexts
-            prompt = _render_prompt(
-                blueprint.system_prompt,
-                user_input_str,
-                tool_context="\n".join(tool_contexts) if tool_contexts else None,
-            )
-            if stream:
-                fragments: List[str] = []
-
-                def _on_tok(tok: str) -> None:
-                    fragments.append(tok)
-
-                asyncio.run(
-                    acomplete(
-                        prompt=prompt,
-                        model=model_name,
-                        stream=True,
-                        on_token=_on_tok,
-                        **(generation_kwargs or {}),
-                    )
-                )
-                text = "".join(fragments)
-            else:
-                text = asyncio.run(
-                    acomplete(
-                        prompt=prompt,
-                        model=model_name,
-                        stream=False,
-                        **(generation_kwargs or {}),
-                    )
-                )
-            # Strip <think>...</think> markup if requested
-            if strip_think:
-                text = re.sub(r"<think>[\s\S]*?</think>", "", text).strip()
-            return {
-                "agent": blueprint.name,
-                "input": input_text or "",
-                "tool_context": tool_contexts,
-                "output": text,
-            }
+    steps, generate = split_plan(blueprint.plan)
+    tool_contexts = await _run_steps(steps, variables, user_input_str)
+    if generate is None:
+        # If no generate step was found, return context only
+        return {
+            "agent": blueprint.name,
+            "input": input_text or "",
+            "tool_context": tool_contexts,
+            "output": "",
+            "warning": "No generate step in plan.",
+        }
+
+    # Single LLM generation; include prior tool contexts, compacted to the prompt budget
+    prompt, compaction = _budgeted_prompt(blueprint, user_input_str, tool_contexts)
+    gen_kwargs = generation_kwargs or {}
+    cached = cache.get(model_name, prompt, gen_kwargs) if cache is not None else None
+    metrics: Optional[GenerationMetrics] = None
+    # Streamed text goes through the think filter as it arrives; only visible text is forwarded
+    think = ThinkFilter() if strip_think else None
+    shown: List[str] = []
+    first_visible: Optional[float] = None
+
+    def _show(fragment: str) -> None:
+        nonlocal first_visible
+        visible = think.feed(fragment) if think is not None else fragment
+        if not visible:
+            return
+        if first_visible is None:
+            first_visible = time.perf_counter()
+        shown.append(visible)
+        if on_token is not None:
+            on_token(visible)
+
+    if cached is not None:
+        text = cached
+        if stream:
+            _show(text)
+    elif stream:
+        fragments: List[str] = []
+
+        def _on_tok(tok: str) -> None:
+            fragments.append(tok)
+            _show(tok)
 
-    # If no generate step was found, return context only
-    return {
+        res = await acomplete(
+            prompt=prompt,
+            model=model_name,
+            stream=True,
+            client=client,
+            on_token=_on_tok,
+            return_result=True,
+            **gen_kwargs,
+        )
+        text = "".join(fragments)
+        if not fragments:
+            # Test doubles and test mode answer without streaming any fragments
+            text = res.text if isinstance(res, Completion) else str(res)
+            _show(text)
+        metrics = res.metrics if isinstance(res, Completion) else None
+    else:
+        res = await acomplete(
+            prompt=prompt,
+            model=model_name,
+            stream=False,
+            client=client,
+            return_result=True,
+            **gen_kwargs,
+        )
+        # Test doubles and custom clients may still hand back plain text
+        text, metrics = (res.text, res.metrics) if isinstance(res, Completion) else (res, None)
+    if cache is not None and cached is None:
+        cache.set(model_name, prompt, gen_kwargs, text)
+    if stream:
+        if think is not None:
+            tail = think.flush()
+            think = None  # the tail is already filtered
+            _show(tail)
+            text = "".join(shown)
+    elif strip_think:
+        # Strip <think>...</think> markup if requested
+        think = ThinkFilter()
+        text = think.feed(text) + think.flush()
+    result: Dict[str, Any] = {
         "agent": blueprint.name,
         "input": input_text or "",
         "tool_context": tool_contexts,
-        "output": "",
-        "warning": "No generate step in plan.",
+        "output": text,
     }
+    if cache is not None:
+        result["cached"] = cached is not None
+    if compaction is not None:
+        result["prompt_budget"] = compaction.as_dict()
+    if stream:
+        result["first_visible_token_ms"] = (
+            round((first_visible - started) * 1000, 1) if first_visible is not None else None
+        )
+    if metrics is not None:
+        result["llm"] = metrics.as_dict()
+    return result
+
+
+def run_agent(
+    blueprint: Blueprint,
+    input_text: Optional[Union[str, Dict[str, Any]]] = None,
+    model_name: str = "qwen3:8b",
+    stream: bool = False,
+    generation_kwargs: Optional[Dict[str, Any]] = None,
+    strip_think: bool = False,
+    cache: Optional[ResponseCache] = None,
+    timings: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Execute the plan with simple semantics: tool_use steps populate tool_context; generate creates final answer.
+
+    Synchronous wrapper over arun_agent; use arun_agent directly from inside a running loop.
+    """
+
+    async def _drive() -> Dict[str, Any]:
+        try:
+            return await arun_agent(
+                blueprint,
+                input_text=input_text,
+                model_name=model_name,
+                stream=stream,
+                generation_kwargs=generation_kwargs,
+                strip_think=strip_think,
+                cache=cache,
+                timings=timings,
+                on_token=on_token,
+            )
+        finally:
+            # Pooled clients are bound to this short-lived loop
+            await aclose_clients()
+
+    return asyncio.run(_drive())
+
+
+async def arun_batch(
+    blueprint: Blueprint,
+    inputs: Iterable[Any],
+    model_name: str = "qwen3:8b",
+    generation_kwargs: Optional[Dict[str, Any]] = None,
+    strip_think: bool = False,
+    concurrency: int = 4,
+    ordered: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the blueprint over many inputs on one event loop, yielding results as they finish.
+
+    Inputs are pulled lazily so at most ``concurrency`` runs are in flight. Each result is the
+    run_agent dict plus an ``index`` (position in ``inputs``); a failed run, or an InvalidLine
+    input from iter_jsonl, yields ``error`` instead of ``output``. With ``ordered`` results
+    come back in input order, otherwise in completion order. All runs share ``client`` or the loop's pooled LLM client.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    # Bound how far ordered mode may run ahead of a slow head-of-line item
+    window = concurrency * 4
+
+    async def _one(index: int, item: Any) -> Dict[str, Any]:
+        if isinstance(item, InvalidLine):
+            return {
+                "index": index,
+                "agent": blueprint.name,
+                "line": item.lineno,
+                "error": item.error,
+            }
+        try:
+            result = await arun_agent(
+                blueprint,
+                input_text=item,
+                model_name=model_name,
+                generation_kwargs=generation_kwargs,
+                strip_think=strip_think,
+                client=client,
+                cache=cache,
+            )
+        except Exception as e:
+            result = {"agent": blueprint.name, "input": item, "error": f"{type(e).__name__}: {e}"}
+        return {"index": index, **result}
+
+    items = iter(enumerate(inputs))
+    pending: Set[asyncio.Future[Dict[str, Any]]] = set()
+    finished: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+    next_emit = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                if ordered and next_index - next_emit >= window:
+                    break
+                try:
+                    index, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(_one(index, item)))
+                next_index += 1
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                res = fut.result()
+                if ordered:
+                    finished[res["index"]] = res
+                else:
+                    next_emit += 1
+                    yield res
+            while ordered and next_emit in finished:
+                yield finished.pop(next_emit)
+                next_emit += 1
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+def run_batch(
+    blueprint: Blueprint,
+    inputs: Iterable[Any],
+    on_result: Callable[[Dict[str, Any]], None],
+    model_name: str = "qwen3:8b",
+    generation_kwargs: Optional[Dict[str, Any]] = None,
+    strip_think: bool = False,
+    concurrency: int = 4,
+    ordered: bool = True,
+    cache: Optional[ResponseCache] = None,
+) -> Dict[str, Any]:
+    """Synchronous wrapper over arun_batch; calls ``on_result`` per finished item.
+
+    Returns the total and failed counts.
+    """
+
+    async def _drive() -> Dict[str, Any]:
+        total = 0
+        failed = 0
+        try:
+            async for res in arun_batch(
+                blueprint,
+                inputs,
+                model_name=model_name,
+                generation_kwargs=generation_kwargs,
+                strip_think=strip_think,
+                concurrency=concurrency,
+                ordered=ordered,
+                cache=cache,
+            ):
+                on_result(res)
+                total += 1
+                if "error" in res:
+                    failed += 1
+        finally:
+            await aclose_clients()
+            close_http_clients()
+        summary: Dict[str, Any] = {"agent": blueprint.name, "total": total, "failed": failed}
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        return summary
+
+    return asyncio.run(_drive())
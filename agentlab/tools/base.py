@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Protocol, runtime_checkable
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional, Protocol, TypeVar, runtime_checkable
 
 
 @runtime_checkable
@@ -8,7 +9,9 @@ class Tool(Protocol):
     """Protocol for a tool implementation.
 
     A tool may be a callable (function) or an object with a __call__ method.
-    The registry treats both uniformly.
+    The registry treats both uniformly. Coroutine functions, objects with an async ``__call__``,
+    and objects providing an async ``acall`` with the same arguments are awaited on the runner's
+    event loop; synchronous tools run in a bounded worker thread pool.
     """
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:  # pragma: no cover - protocol
@@ -16,3 +19,41 @@ class Tool(Protocol):
 
 
 ToolRegistryMap = Dict[str, Tool | Callable[..., Any]]
+
+
+@dataclass(frozen=True)
+class ToolOptions:
+    """Execution metadata a tool declares when registered.
+
+    ``cacheable`` marks the tool as pure: the same arguments always give the same output, so the
+    runner may memoize results for ``ttl`` seconds (None = no expiry), keeping at most
+    ``max_entries`` argument sets per tool. ``timeout`` bounds a single call in seconds (None =
+    no limit); a call that overruns returns a ``[tool-error]`` message instead of an output.
+    ``cpu_bound`` tools hold the GIL doing heavy work, so the runner calls them in a worker process
+    (the tool and its arguments must be picklable, else it falls back to a thread).
+    """
+
+    cacheable: bool = False
+    ttl: Optional[float] = None
+    max_entries: int = 256
+    timeout: Optional[float] = None
+    cpu_bound: bool = False
+
+
+TOOL_OPTIONS_ATTR = "__agentlab_tool__"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def tool(**options: Any) -> Callable[[F], F]:
+    """Decorator attaching ToolOptions to a tool function, e.g. ``@tool(cacheable=True)``.
+
+    Plugins use it to declare metadata that travels with their entry point callables.
+    """
+
+    def _wrap(fn: F) -> F:
+        current = getattr(fn, TOOL_OPTIONS_ATTR, ToolOptions())
+        setattr(fn, TOOL_OPTIONS_ATTR, replace(current, **options))
+        return fn
+
+    return _wrap
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional
+
+
+@dataclass(frozen=True)
+class ToolExecutorConfig:
+    """Sizing for the worker pools that run synchronous tools off the event loop.
+
+    The thread pool is bounded so a burst of slow sync tools queues up instead of spawning threads
+    without limit; async tools run on the loop and never occupy a worker. CPU-bound tools go to a
+    process pool of ``max_processes`` workers (None = CPU count) started with ``mp_context``;
+    "spawn" avoids forking a process that already runs threads.
+    """
+
+    max_workers: int = 8
+    max_processes: Optional[int] = None
+    mp_context: str = "spawn"
+
+
+_EXECUTOR_CONFIG = ToolExecutorConfig()
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_PROCESS_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def configure_tool_executor(**overrides: Any) -> ToolExecutorConfig:
+    """Override the tool worker pool settings; current pools are shut down and rebuilt lazily."""
+    global _EXECUTOR_CONFIG
+    _EXECUTOR_CONFIG = replace(_EXECUTOR_CONFIG, **overrides)
+    shutdown_tool_executor()
+    return _EXECUTOR_CONFIG
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool for synchronous tools, creating it on first use."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=_EXECUTOR_CONFIG.max_workers, thread_name_prefix="agentlab-tool"
+            )
+        return _EXECUTOR
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """Return the process-wide pool for CPU-bound tools, creating it on first use."""
+    global _PROCESS_EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _PROCESS_EXECUTOR is None:
+            _PROCESS_EXECUTOR = ProcessPoolExecutor(
+                max_workers=_EXECUTOR_CONFIG.max_processes,
+                mp_context=multiprocessing.get_context(_EXECUTOR_CONFIG.mp_context),
+            )
+        return _PROCESS_EXECUTOR
+
+
+def shutdown_tool_executor(wait: bool = False) -> None:
+    """Shut down the tool pools; the next sync tool call starts fresh ones."""
+    global _EXECUTOR, _PROCESS_EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+        processes, _PROCESS_EXECUTOR = _PROCESS_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+    if processes is not None:
+        processes.shutdown(wait=wait, cancel_futures=True)
+
+
+def terminate_process_pool() -> None:
+    """Kill the CPU-bound tool workers and drop the pool; the next call starts a fresh one.
+
+    Used when a process call is abandoned (timeout, cancellation): the pool joins its workers at
+    interpreter exit, so a worker left running would hold up exit and queue later calls. Other
+    calls still running in the pool fail with BrokenProcessPool.
+    """
+    global _PROCESS_EXECUTOR
+    with _EXECUTOR_LOCK:
+        processes, _PROCESS_EXECUTOR = _PROCESS_EXECUTOR, None
+    if processes is None:
+        return
+    # No public API for this before Python 3.14's terminate_workers()
+    for worker in list(getattr(processes, "_processes", {}).values()):
+        if worker.is_alive():
+            worker.kill()
+    processes.shutdown(wait=False, cancel_futures=True)
+
+
+def is_picklable(*objs: Any) -> bool:
+    """True if the objects can be sent to a worker process (module-level functions, plain data)."""
+    try:
+        pickle.dumps(objs)
+    except Exception:
+        return False
+    return True
+
+
+async def run_in_tool_thread(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable in the tool pool, keeping the caller's context (e.g. tracing)."""
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_tool_executor(), call)
+
+
+async def run_in_tool_process(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a picklable callable in the process pool for CPU-bound tools."""
+    return await asyncio.get_running_loop().run_in_executor(get_process_executor(), fn, *args)
+
+
+async def run_in_daemon_thread(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on its own daemon thread, keeping the caller's context.
+
+    For calls that may be abandoned, such as a sync tool with a timeout: pool threads are joined
+    at interpreter exit, so a hung call there would stall shutdown; a daemon thread does not.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[Any] = loop.create_future()
+    ctx = contextvars.copy_context()
+
+    def _settle(result: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return  # the caller gave up (timeout or cancellation)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _target() -> None:
+        try:
+            result, error = ctx.run(fn, *args, **kwargs), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(_settle, result, error)
+        except RuntimeError:
+            pass  # loop already closed: nobody is waiting for this result
+
+    threading.Thread(target=_target, name="agentlab-tool-timed", daemon=True).start()
+    return await future
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import orjson
+
+from ..utils.kvstore import SQLiteStore
+from .base import ToolOptions
+
+
+def canonical_args(args: Optional[Dict[str, Any]]) -> bytes:
+    """Order-independent serialization of tool arguments, used as the memo key."""
+    return orjson.dumps(args or {}, option=orjson.OPT_SORT_KEYS, default=str)
+
+
+class ToolMemo:
+    """Per-tool LRU of outputs for tools registered as cacheable, with optional disk backing.
+
+    Entries expire after the tool's ``ttl``; each tool keeps at most ``max_entries`` argument
+    sets in memory. With persistence enabled, misses fall back to a SQLite store so results
+    survive across processes. Hit/miss counts are tracked per tool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, "OrderedDict[bytes, Tuple[float, str]]"] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._store: Optional[SQLiteStore] = None
+
+    def get(self, name: str, args: Optional[Dict[str, Any]], options: ToolOptions) -> Optional[str]:
+        key = canonical_args(args)
+        now = time.time()
+        with self._lock:
+            stats = self._stats.setdefault(name, {"hits": 0, "misses": 0})
+            entries = self._entries.get(name)
+            hit = entries.get(key) if entries is not None else None
+            if hit is not None and entries is not None:
+                if options.ttl is None or now - hit[0] <= options.ttl:
+                    entries.move_to_end(key)
+                    stats["hits"] += 1
+                    return hit[1]
+                del entries[key]
+            store = self._store
+        if store is not None:
+            try:
+                raw = store.get(self._disk_key(name, key))
+            except (OSError, sqlite3.Error):
+                raw = None  # a busy or broken store is a miss, not a failed tool call
+            if raw is not None:
+                stored_at, output = orjson.loads(raw)
+                if options.ttl is None or now - stored_at <= options.ttl:
+                    with self._lock:
+                        self._remember(name, key, stored_at, output, options)
+                        stats["hits"] += 1
+                    return output
+        with self._lock:
+            stats["misses"] += 1
+        return None
+
+    def set(
+        self, name: str, args: Optional[Dict[str, Any]], options: ToolOptions, output: str
+    ) -> None:
+        key = canonical_args(args)
+        now = time.time()
+        with self._lock:
+            self._remember(name, key, now, output, options)
+            store = self._store
+        if store is not None:
+            try:
+                store.set(self._disk_key(name, key), orjson.dumps([now, output]))
+            except (OSError, sqlite3.Error):
+                pass
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(s) for name, s in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            if self._store is not None:
+                self._store.clear()
+
+    def persist_to(self, directory: Optional[Union[str, Path]], max_entries: int = 50_000) -> None:
+        """Back the memo with a SQLite file under directory (None disables persistence)."""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+            self._store = (
+                SQLiteStore(Path(directory) / "tools.sqlite3", max_entries=max_entries)
+                if directory is not None
+                else None
+            )
+
+    def _remember(
+        self, name: str, key: bytes, stored_at: float, output: str, options: ToolOptions
+    ) -> None:
+        entries = self._entries.setdefault(name, OrderedDict())
+        entries[key] = (stored_at, output)
+        entries.move_to_end(key)
+        while len(entries) > max(options.max_entries, 1):
+            entries.popitem(last=False)
+
+    @staticmethod
+    def _disk_key(name: str, key: bytes) -> str:
+        return name + ":" + hashlib.sha256(key).hexdigest()
+
+
+TOOL_MEMO = ToolMemo()
+
+
+def tool_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Per-tool memo hit/miss counts for this process."""
+    return TOOL_MEMO.stats()
+
+
+def enable_tool_cache_persistence(directory: Optional[Union[str, Path]]) -> None:
+    """Persist memoized tool outputs under directory (None turns persistence off)."""
+    TOOL_MEMO.persist_to(directory)
@@ -1,34 +1,201 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import os
+import sqlite3
+from dataclasses import asdict, dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import httpx
-import yaml
+import orjson
 
-from ..registry import register_tool
-from ..runtime.http_tool import http_call
+from ...tracing import span
+from ...utils.kvstore import SQLiteStore
+from ...utils.yamlio import safe_load as yaml_safe_load
+from ..base import ToolOptions
+from ..registry import register_lazy_tool
+from ..runtime.http_tool import ahttp_call, http_call
+from ..runtime.projection import ResponseLimits
 
+Operation = Tuple[str, str, str, List[str], List[str], Optional[float], Dict[str, Any]]
 
-def _load_spec(source: Union[str, Path]) -> Dict[str, Any]:
-    # Support http(s) URLs and local files
+# Response limit extensions, at spec level (defaults) or per operation
+_LIMIT_EXTENSIONS = {
+    "x-agentlab-max-bytes": "max_bytes",
+    "x-agentlab-fields": "fields",
+    "x-agentlab-max-items": "max_items",
+}
+
+# Bump when the layout of a compiled spec index changes
+_INDEX_VERSION = 2
+
+
+@dataclass(frozen=True)
+class SpecIndex:
+    """Compact view of a spec: just what is needed to build its GET/POST tools.
+
+    Each operation is ``(operation_id, method, path, path_params, query_params, cache_ttl,
+    limits)``, with ``cache_ttl`` taken from an ``x-agentlab-cache-ttl`` extension (None if absent)
+    and ``limits`` from the ``x-agentlab-max-bytes``/``-fields``/``-max-items`` extensions.
+    """
+
+    base_url: str
+    api_key_header: Optional[str]
+    operations: List[Operation]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"v": _INDEX_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["SpecIndex"]:
+        """Rebuild an index from to_dict output; None if it was written by another version."""
+        if data.get("v") != _INDEX_VERSION:
+            return None
+        ops = [tuple(op) for op in data["operations"]]
+        return cls(data["base_url"], data["api_key_header"], ops)
+
+
+# Compiled indexes by cache key, for repeated ingestion within one process
+_INDEX_MEMO: Dict[str, SpecIndex] = {}
+
+
+def _parse_spec(text: Union[str, bytes], is_yaml: Optional[bool] = None) -> Dict[str, Any]:
+    if is_yaml:
+        return yaml_safe_load(text)
+    # Try JSON first, then YAML
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        if is_yaml is False:
+            raise
+        return yaml_safe_load(text)
+
+
+def compile_spec(spec: Dict[str, Any]) -> SpecIndex:
+    """Reduce a parsed OpenAPI spec to its SpecIndex."""
+    base_url = (spec.get("servers") or [{}])[0].get("url", "")
+    api_key_header = None
+    sec = spec.get("components", {}).get("securitySchemes", {}) or {}
+    for _, sch in sec.items():
+        if sch.get("type") == "apiKey" and sch.get("in") == "header":
+            api_key_header = sch.get("name")
+            break
+
+    operations: List[Operation] = []
+    spec_limits = _limit_options(spec)
+    paths: Dict[str, Any] = spec.get("paths", {})
+    for path, ops in paths.items():
+        if not isinstance(ops, dict):
+            continue
+        for method in ["get", "post"]:
+            op = ops.get(method)
+            if not op:
+                continue
+            op_id = op.get("operationId") or f"{path.strip('/').replace('/', '_')}_{method}"
+            path_params, query_params = _infer_args(op.get("parameters", []))
+            ttl = op.get("x-agentlab-cache-ttl")
+            operations.append(
+                (
+                    op_id,
+                    method.upper(),
+                    path,
+                    path_params,
+                    query_params,
+                    float(ttl) if ttl is not None else None,
+                    {**spec_limits, **_limit_options(op)},
+                )
+            )
+    return SpecIndex(base_url, api_key_header, operations)
+
+
+def _limit_options(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {opt: node[ext] for ext, opt in _LIMIT_EXTENSIONS.items() if node.get(ext) is not None}
+
+
+def load_spec_index(
+    source: Union[str, Path], cache_dir: Union[str, Path, None] = None
+) -> SpecIndex:
+    """Return the compiled index of a spec, reusing a cached one when the spec is unchanged.
+
+    Local files are keyed by a hash of their content; URLs are revalidated with the ETag of the
+    cached copy, so an unchanged remote spec costs a 304 and no parsing. The cache is kept in
+    memory unless ``cache_dir`` is given; disk cache errors fall back to parsing the spec.
+    """
+    with span("openapi.index", source=str(source)) as sp:
+        store = _spec_store(cache_dir) if cache_dir else None
+        try:
+            index, hit = _load_spec_index(source, store)
+        finally:
+            if store is not None:
+                store.close()
+        if sp is not None:
+            sp.attrs["cached"] = hit
+            sp.attrs["operations"] = len(index.operations)
+        return index
+
+
+def _spec_store(cache_dir: Union[str, Path]) -> Optional[SQLiteStore]:
+    try:
+        return SQLiteStore(Path(cache_dir) / "openapi.sqlite3", max_entries=256)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _store_get(store: Optional[SQLiteStore], key: str) -> Optional[bytes]:
+    if store is None:
+        return None
+    try:
+        return store.get(key)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _store_set(store: Optional[SQLiteStore], key: str, value: bytes) -> None:
+    if store is None:
+        return
+    try:
+        store.set(key, value)
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def _load_spec_index(
+    source: Union[str, Path], store: Optional[SQLiteStore]
+) -> Tuple[SpecIndex, bool]:
     if isinstance(source, str) and source.startswith(("http://", "https://")):
-        resp = httpx.get(source, timeout=20)
+        key = f"url:{source}"
+        raw = _store_get(store, key)
+        cached = orjson.loads(raw) if raw is not None else None
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+        resp = httpx.get(source, timeout=20, headers=headers)
+        if resp.status_code == 304 and cached:
+            index = SpecIndex.from_dict(cached["index"])
+            if index is not None:
+                return index, True
+            resp = httpx.get(source, timeout=20)
         resp.raise_for_status()
-        text = resp.text
-        # Try JSON first, then YAML
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return yaml.safe_load(text)
-    # Local path
+        index = compile_spec(_parse_spec(resp.content))
+        etag = resp.headers.get("ETag")
+        if etag:
+            _store_set(store, key, orjson.dumps({"etag": etag, "index": index.to_dict()}))
+        return index, False
+
     p = Path(source)
-    text = p.read_text(encoding="utf-8")
-    if p.suffix.lower() in {".yaml", ".yml"}:
-        return yaml.safe_load(text)
-    return json.loads(text)
+    data = p.read_bytes()
+    key = f"file:{hashlib.sha256(data).hexdigest()}"
+    index = _INDEX_MEMO.get(key)
+    if index is not None:
+        return index, True
+    raw = _store_get(store, key)
+    index = SpecIndex.from_dict(orjson.loads(raw)) if raw is not None else None
+    hit = index is not None
+    if index is None:
+        index = compile_spec(_parse_spec(data, p.suffix.lower() in {".yaml", ".yml"}))
+        _store_set(store, key, orjson.dumps(index.to_dict()))
+    _INDEX_MEMO[key] = index
+    return index, hit
 
 
 def _infer_args(params: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
@@ -46,71 +213,116 @@ def _infer_args(params: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
     return path_params, query_params
 
 
+class OpenAPITool:
+    """Tool for one API operation with a sync path (__call__) and an async path (acall).
+
+    The runner awaits ``acall`` on its event loop; direct callers can keep calling it as a
+    plain function. ``limits`` bound the response text; a call can override them with the
+    ``_max_bytes``, ``_fields`` and ``_max_items`` arguments (e.g. from a blueprint ``with:``).
+    """
+
+    def __init__(
+        self,
+        method: str,
+        base_url: str,
+        path: str,
+        path_params: List[str],
+        query_params: List[str],
+        headers: Dict[str, str],
+        limits: Optional[ResponseLimits] = None,
+    ) -> None:
+        self.method = method
+        self.base_url = base_url
+        self.path = path
+        self.path_params = path_params
+        self.query_params = query_params
+        self.headers = headers
+        self.limits = limits
+
+    def _request_args(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "headers": self.headers,
+            "path_params": {k: kwargs.get(k) for k in self.path_params},
+            "query": {k: kwargs.get(k) for k in self.query_params},
+            "json_body": kwargs.get("body") if self.method == "POST" else None,
+            "limits": ResponseLimits.from_options(
+                kwargs.get("_max_bytes"),
+                kwargs.get("_fields"),
+                kwargs.get("_max_items"),
+                base=self.limits,
+            ),
+        }
+
+    def __call__(self, **kwargs: Any) -> str:
+        return http_call(self.method, self.base_url, self.path, **self._request_args(kwargs))
+
+    async def acall(self, **kwargs: Any) -> str:
+        return await ahttp_call(self.method, self.base_url, self.path, **self._request_args(kwargs))
+
+
+def _build_tool(
+    method: str,
+    base_url: str,
+    path: str,
+    path_params: List[str],
+    query_params: List[str],
+    api_key_header: Optional[str],
+    tag: str,
+    limits: Dict[str, Any],
+) -> OpenAPITool:
+    # Security: if apiKey in header, read from env TOKEN
+    sec_headers: Dict[str, str] = {}
+    if api_key_header:
+        token = os.getenv(f"{tag.upper()}_TOKEN")
+        if token:
+            sec_headers[api_key_header] = token
+    return OpenAPITool(
+        method,
+        base_url,
+        path,
+        path_params,
+        query_params,
+        sec_headers,
+        ResponseLimits.from_options(**limits),
+    )
+
+
 def ingest_openapi(
-    spec_path: Union[str, Path], tag: str, base_url_override: str | None = None
+    spec_path: Union[str, Path],
+    tag: str,
+    base_url_override: str | None = None,
+    cache_ttl: float | None = None,
+    cache_dir: Union[str, Path, None] = None,
 ) -> List[str]:
     """Parse a simple OpenAPI spec and register tools for GET/POST endpoints.
 
-    Returns a list of registered tool names.
+    GET tools are memoized for ``cache_ttl`` seconds when given; an operation can also opt in
+    with an ``x-agentlab-cache-ttl`` extension. Response limits (see ResponseLimits) come from
+    ``x-agentlab-max-bytes``/``-fields``/``-max-items`` on the spec or operation. The compiled
+    spec is cached under ``cache_dir`` if given (see load_spec_index) and each tool is only built
+    when first looked up. Returns a list of registered tool names.
     """
-    spec = _load_spec(spec_path)
-    base_url = base_url_override or spec.get("servers", [{}])[0].get("url", "")
+    index = load_spec_index(spec_path, cache_dir)
+    base_url = base_url_override or index.base_url
     assert base_url, "No base URL found; provide --base-url or include servers[].url in spec"
 
     registered: List[str] = []
-    paths: Dict[str, Any] = spec.get("paths", {})
-    for path, ops in paths.items():
-        if not isinstance(ops, dict):
-            continue
-        for method in ["get", "post"]:
-            op = ops.get(method)
-            if not op:
-                continue
-            op_id = op.get("operationId") or f"{path.strip('/').replace('/', '_')}_{method}"
-            tool_name = f"{tag}.{op_id}"
-            params = op.get("parameters", [])
-            path_params, query_params = _infer_args(params)
-
-            # Security: if apiKey in header, read from env TOKEN
-            sec_headers: Dict[str, str] = {}
-            sec = spec.get("components", {}).get("securitySchemes", {}) or {}
-            api_key_name = None
-            for _, sch in sec.items():
-                if sch.get("type") == "apiKey" and sch.get("in") == "header":
-                    api_key_name = sch.get("name")
-                    break
-            token = None
-            if api_key_name:
-                env_name = f"{tag.upper()}_TOKEN"
-                token = os.getenv(env_name)
-                if token:
-                    sec_headers[api_key_name] = token
-
-            def make_tool(
-                _base=base_url,
-                _path=path,
-                _method=method.upper(),
-                _path_params=path_params,
-                _query_params=query_params,
-                _headers=sec_headers,
-            ):
-                def _tool(**kwargs: Any) -> str:
-                    path_vals = {k: kwargs.get(k) for k in _path_params}
-                    query_vals = {k: kwargs.get(k) for k in _query_params}
-                    body = kwargs.get("body") if _method == "POST" else None
-                    return http_call(
-                        _method,
-                        _base,
-                        _path,
-                        headers=_headers,
-                        path_params=path_vals,
-                        query=query_vals,
-                        json_body=body,
-                    )
-
-                return _tool
-
-            register_tool(tool_name, make_tool())
-            registered.append(tool_name)
+    for op_id, method, path, path_params, query_params, op_ttl, limits in index.operations:
+        tool_name = f"{tag}.{op_id}"
+        ttl = op_ttl if op_ttl is not None else (cache_ttl if method == "GET" else None)
+        options = ToolOptions(cacheable=True, ttl=float(ttl)) if ttl is not None else None
+        loader = partial(
+            _build_tool,
+            method,
+            base_url,
+            path,
+            path_params,
+            query_params,
+            index.api_key_header,
+            tag,
+            limits,
+        )
+        register_lazy_tool(tool_name, loader, options)
+        registered.append(tool_name)
 
     return registered
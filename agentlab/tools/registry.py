@@ -1,22 +1,108 @@
 from __future__ import annotations
 
+import hashlib
 import importlib.metadata as importlib_metadata
-from typing import Any, Callable, Dict, Iterable, List, Optional
+import inspect
+import os
+import sys
+import threading
+from dataclasses import asdict, replace
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import orjson
+
+from ..tracing import span
+from ..utils.kvstore import SQLiteStore
+from .base import TOOL_OPTIONS_ATTR, ToolOptions
 
 ToolFunction = Callable[..., Any]
 
 
 _TOOL_REGISTRY: Dict[str, ToolFunction] = {}
+_TOOL_OPTIONS: Dict[str, ToolOptions] = {}
 
 
-def register_tool(name: str, fn: ToolFunction) -> None:
-    """Register a tool function under a unique name."""
+def register_tool(name: str, fn: ToolFunction, options: Optional[ToolOptions] = None) -> None:
+    """Register a tool function under a unique name.
+
+    Options default to those attached with the ``tool`` decorator, if any.
+    """
     _TOOL_REGISTRY[name] = fn
+    _TOOL_OPTIONS[name] = options or getattr(fn, TOOL_OPTIONS_ATTR, None) or ToolOptions()
+
+
+class LazyTool:
+    """Registry placeholder for a tool that is only built (imported, compiled) when first used."""
+
+    def __init__(self, loader: Callable[[], ToolFunction]) -> None:
+        self._loader = loader
+
+    def load(self) -> ToolFunction:
+        return self._loader()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.load()(*args, **kwargs)
+
+
+def register_lazy_tool(
+    name: str, loader: Callable[[], ToolFunction], options: Optional[ToolOptions] = None
+) -> None:
+    """Register a tool whose callable ``loader`` builds on first lookup via get_tool."""
+    register_tool(name, LazyTool(loader), options)
+
+
+def get_tool_options(name: str) -> ToolOptions:
+    """Return the execution options registered for a tool (defaults if unknown)."""
+    return _TOOL_OPTIONS.get(name) or ToolOptions()
+
+
+# Flags a plugin may set as entry point extras, e.g. ``add = "pkg.tools:add [cpu_bound]"``
+_ENTRY_POINT_FLAGS = ("cacheable", "cpu_bound")
+
+
+def _entry_point_options(ep: Any, fn: ToolFunction) -> Optional[ToolOptions]:
+    flags = {flag: True for flag in getattr(ep, "extras", None) or () if flag in _ENTRY_POINT_FLAGS}
+    if not flags:
+        return None
+    return replace(getattr(fn, TOOL_OPTIONS_ATTR, None) or ToolOptions(), **flags)
 
 
 def get_tool(name: str) -> Optional[ToolFunction]:
-    """Retrieve a tool by name if registered; otherwise None."""
-    return _TOOL_REGISTRY.get(name)
+    """Retrieve a tool by name if registered; otherwise None.
+
+    Lazily registered tools (e.g. plugin tools restored from the discovery index) are built here,
+    on first use.
+    """
+    fn = _TOOL_REGISTRY.get(name)
+    if isinstance(fn, LazyTool):
+        try:
+            fn = fn.load()
+        except Exception:
+            _TOOL_REGISTRY.pop(name, None)
+            return None
+        _TOOL_REGISTRY[name] = fn
+    return fn
+
+
+def get_async_tool(name: str) -> Optional[Callable[..., Awaitable[Any]]]:
+    """Return the tool's native async entry point, if it has one.
+
+    That is an ``acall`` method, the tool itself when it is an ``async def`` function (or a
+    partial of one), or an object whose ``__call__`` is a coroutine function.
+    """
+    fn = get_tool(name)
+    if fn is None:
+        return None
+    acall = getattr(fn, "acall", None)
+    if callable(acall):
+        return acall
+    if inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(
+        getattr(fn, "__call__", None)
+    ):
+        return fn
+    return None
 
 
 def list_tools() -> List[str]:
@@ -24,55 +110,171 @@ def list_tools() -> List[str]:
     return sorted(_TOOL_REGISTRY.keys())
 
 
+_DEFAULTS_LOADED = False
+
+
 def load_default_tools() -> None:
     """Load built-in mock tools once. Safe to call multiple times."""
+    global _DEFAULTS_LOADED
+    if _DEFAULTS_LOADED:
+        return
     # Import locally to avoid import cycles during package init
     from agentlab.mocks import tool_mocks
 
     # Register/mock tools dynamically from the mock registry
     for name, fn in tool_mocks.MOCK_REGISTRY.items():
         register_tool(name, fn)
+    _DEFAULTS_LOADED = True
+
+
+# Entry point groups already discovered in this process
+_DISCOVERED: Set[str] = set()
+_DISCOVERY_LOCK = threading.Lock()
+# Optional on-disk index of discovered plugin tools, see enable_plugin_index
+_PLUGIN_INDEX: Optional[SQLiteStore] = None
+# Tools produced by each entry point (by "module:attr" value), so factories run once per process
+_ENTRY_POINT_TOOLS: Dict[str, Dict[str, Any]] = {}
 
 
-def load_plugin_tools(entry_point_group: str = "agentlab.tools") -> None:
+def load_plugin_tools(entry_point_group: str = "agentlab.tools", refresh: bool = False) -> None:
     """Discover and load tools from installed packages via entry points.
 
     Packages can expose an entry point mapping of name->callable (e.g., a dict), or individual
-    callables. If an entry point returns a dict, we register all items.
+    callables. If an entry point returns a dict, we register all items. Discovery runs once per
+    process and group; pass ``refresh=True`` to pick up packages installed since.
     """
-    group: Iterable[Any] = []
+    with span("load_plugin_tools", group=entry_point_group) as sp:
+        with _DISCOVERY_LOCK:
+            cached = entry_point_group in _DISCOVERED and not refresh
+            if not cached:
+                _load_plugin_tools(entry_point_group, use_index=not refresh)
+                _DISCOVERED.add(entry_point_group)
+        if sp is not None:
+            sp.attrs["cached"] = cached
+            sp.attrs["registered_tools"] = len(_TOOL_REGISTRY)
+
+
+def reset_plugin_discovery() -> None:
+    """Forget which entry point groups were discovered, so the next load walks them again."""
+    with _DISCOVERY_LOCK:
+        _DISCOVERED.clear()
+        _ENTRY_POINT_TOOLS.clear()
+
+
+def enable_plugin_index(directory: Optional[Union[str, Path]]) -> None:
+    """Persist discovered plugin tools under directory (None turns the index off).
+
+    The index is keyed by a fingerprint of the installed distributions, so a new process with the
+    same distributions registers plugin tools without scanning site-packages or importing plugin
+    modules; each module is imported when one of its tools is first used.
+    """
+    global _PLUGIN_INDEX
+    if _PLUGIN_INDEX is not None:
+        _PLUGIN_INDEX.close()
+    _PLUGIN_INDEX = (
+        SQLiteStore(Path(directory) / "plugins.sqlite3", max_entries=64)
+        if directory is not None
+        else None
+    )
+
+
+def _distributions_fingerprint() -> str:
+    """Hash of the installed distributions: name, version and dist-info mtimes.
+
+    Installing, upgrading or reinstalling a package (editable ones included) changes it; files
+    written to the working directory do not, so it is left off the search path.
+    """
+    cwd = os.getcwd()
+    paths = [entry for entry in sys.path if entry and os.path.abspath(entry) != cwd]
+    digest = hashlib.sha256()
+    for dist in importlib_metadata.distributions(path=paths):
+        info = getattr(dist, "_path", None)  # the .dist-info/.egg-info directory
+        if isinstance(info, Path):
+            # The directory name carries name and version without parsing METADATA
+            entry_points = info / "entry_points.txt"
+            parts = [str(info), str(_mtime_ns(info)), str(_mtime_ns(entry_points))]
+        else:
+            parts = [str(dist.metadata["Name"]), str(dist.version)]
+        digest.update("\0".join(parts).encode() + b"\n")
+    return digest.hexdigest()
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _load_indexed_tool(name: str, ep_name: str, value: str, group: str) -> ToolFunction:
+    """Import the entry point behind an indexed plugin tool and return the tool."""
+    tools = _ENTRY_POINT_TOOLS.get(value)
+    if tools is None:
+        ep = importlib_metadata.EntryPoint(name=ep_name, value=value, group=group)
+        tools = _ENTRY_POINT_TOOLS[value] = _expand_entry_point(ep.name, ep.load())
+    return tools[name]
+
+
+def _expand_entry_point(ep_name: str, obj: Any) -> Dict[str, Any]:
+    """Return the tools an entry point object provides, as name -> callable."""
+    # Case 1: entry point directly exposes a mapping name->callable
+    if isinstance(obj, dict):
+        return {str(name): fn for name, fn in obj.items() if callable(fn)}
+    if not callable(obj):
+        return {}
+    # Case 2: entry point is a callable; it may itself be a tool, or a factory returning a mapping
+    try:
+        produced = obj()  # try zero-arg call to detect factory pattern
+    except TypeError:
+        produced = None
+    except Exception:
+        produced = None
+    if isinstance(produced, dict):
+        return {str(name): fn for name, fn in produced.items() if callable(fn)}
+    return {ep_name: obj}
+
+
+def _iter_entry_points(entry_point_group: str) -> Iterable[Any]:
     try:
         eps = importlib_metadata.entry_points()
         if hasattr(eps, "select"):
-            group = eps.select(group=entry_point_group)
-        else:
-            # Older importlib_metadata: mapping-style access
-            group = importlib_metadata.entry_points().get(entry_point_group, [])
+            return eps.select(group=entry_point_group)
+        # Older importlib_metadata: mapping-style access
+        return importlib_metadata.entry_points().get(entry_point_group, [])
     except Exception:
-        group = []
+        return []
+
 
-    for ep in group:
+def _load_plugin_tools(entry_point_group: str, use_index: bool = True) -> None:
+    store = _PLUGIN_INDEX
+    if store is not None and use_index:
+        raw = store.get(f"{entry_point_group}:{_distributions_fingerprint()}")
+        if raw is not None:
+            for name, ep_name, value, options in orjson.loads(raw):
+                loader = partial(_load_indexed_tool, name, ep_name, value, entry_point_group)
+                register_lazy_tool(name, loader, ToolOptions(**options))
+            return
+
+    index: Optional[List[Tuple[str, str, str, Dict[str, Any]]]] = []
+    for ep in _iter_entry_points(entry_point_group):
         try:
             obj = ep.load()
         except Exception:
             continue
-        # Case 1: entry point directly exposes a mapping name->callable
-        if isinstance(obj, dict):
-            for name, fn in obj.items():
-                if callable(fn):
-                    register_tool(str(name), fn)
-            continue
-        # Case 2: entry point is a callable; it may itself be a tool, or a factory returning a mapping
-        if callable(obj):
-            try:
-                produced = obj()  # try zero-arg call to detect factory pattern
-            except TypeError:
-                produced = None
-            except Exception:
-                produced = None
-            if isinstance(produced, dict):
-                for name, fn in produced.items():
-                    if callable(fn):
-                        register_tool(str(name), fn)
-            else:
-                register_tool(str(ep.name), obj)
+        tools = _expand_entry_point(str(ep.name), obj)
+        value = getattr(ep, "value", None)
+        if isinstance(value, str):
+            _ENTRY_POINT_TOOLS[value] = tools
+        else:
+            index = None  # not a real entry point (e.g. constructed in tests); nothing to persist
+        for name, fn in tools.items():
+            register_tool(name, fn, _entry_point_options(ep, fn))
+            if index is not None:
+                options = asdict(get_tool_options(name))
+                index.append((name, str(ep.name), str(value), options))
+    if store is not None and index is not None:
+        store.set(f"{entry_point_group}:{_distributions_fingerprint()}", orjson.dumps(index))
+
+
+if os.getenv("AGENTLAB_PLUGIN_INDEX"):
+    enable_plugin_index(os.environ["AGENTLAB_PLUGIN_INDEX"])
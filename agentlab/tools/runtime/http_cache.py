@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+import orjson
+
+from ...utils.kvstore import DEFAULT_CACHE_DIR, SQLiteStore
+
+
+@dataclass
+class CachedResponse:
+    """A stored GET body with the freshness and validator headers it came with."""
+
+    body: bytes
+    stored_at: float
+    max_age: Optional[float]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    @property
+    def fresh(self) -> bool:
+        return self.max_age is not None and time.time() - self.stored_at < self.max_age
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """``"public, max-age=60"`` -> ``{"public": None, "max-age": "60"}`` (lowercased names)."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+class HttpCache:
+    """On-disk cache of API GET responses following HTTP caching headers.
+
+    Responses are fresh for ``Cache-Control: max-age`` seconds (``no-cache`` means always
+    revalidate, ``no-store`` is never stored). Stale entries are revalidated with
+    ``If-None-Match``/``If-Modified-Since``; a 304 reuses the stored body. Bodies live in a SQLite
+    file capped at ``max_entries``/``max_bytes`` with LRU eviction. Counts fresh hits,
+    revalidations (304) and full fetches.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 128 * 1024 * 1024,
+    ) -> None:
+        self._store = SQLiteStore(
+            Path(directory) / "http.sqlite3", max_entries=max_entries, max_bytes=max_bytes
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.fetches = 0
+
+    @staticmethod
+    def key(url: str, headers: Optional[Mapping[str, str]]) -> str:
+        # Request headers (e.g. API keys) are part of the key so responses never cross credentials
+        material = {"url": url, "headers": dict(headers or {})}
+        return hashlib.sha256(orjson.dumps(material, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = self._store.get(key)
+        except (OSError, sqlite3.Error):
+            return None  # a busy or broken store is a miss, not a failed request
+        if raw is None:
+            return None
+        meta, _, body = raw.partition(b"\n")
+        return CachedResponse(body=body, **orjson.loads(meta))
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def revalidated(self, key: str, entry: CachedResponse, headers: Mapping[str, str]) -> bytes:
+        """Record a 304 for entry: refresh its freshness from the new headers, return its body."""
+        with self._lock:
+            self.revalidations += 1
+        self._save(key, entry.body, {**_entry_headers(entry), **headers})
+        return entry.body
+
+    def fetched(self, key: str, body: Optional[bytes], headers: Mapping[str, str]) -> None:
+        """Record a full response; store it if complete (body not None) and cacheable."""
+        with self._lock:
+            self.fetches += 1
+        if body is not None:
+            self._save(key, body, headers)
+
+    def _save(self, key: str, body: bytes, headers: Mapping[str, str]) -> None:
+        lower = {k.lower(): v for k, v in headers.items()}
+        directives = parse_cache_control(lower.get("cache-control"))
+        if "no-store" in directives:
+            return
+        max_age: Optional[float] = None
+        if "no-cache" in directives:
+            max_age = 0.0
+        elif directives.get("max-age"):
+            try:
+                max_age = float(directives["max-age"] or 0)
+            except ValueError:
+                max_age = None
+        etag = lower.get("etag")
+        last_modified = lower.get("last-modified")
+        if not max_age and not etag and not last_modified:
+            return  # nothing to serve it by or revalidate it with
+        meta = {
+            "stored_at": time.time(),
+            "max_age": max_age,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        try:
+            self._store.set(key, orjson.dumps(meta) + b"\n" + body)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "revalidations": self.revalidations, "fetches": self.fetches}
+
+    def close(self) -> None:
+        self._store.close()
+
+
+def _entry_headers(entry: CachedResponse) -> Dict[str, str]:
+    # Headers of the stored response, as a 304 may omit unchanged ones
+    headers: Dict[str, str] = {}
+    if entry.max_age is not None:
+        headers["cache-control"] = f"max-age={entry.max_age:g}"
+    if entry.etag:
+        headers["etag"] = entry.etag
+    if entry.last_modified:
+        headers["last-modified"] = entry.last_modified
+    return headers
+
+
+_HTTP_CACHE: Optional[HttpCache] = None
+
+
+def enable_http_cache(
+    directory: Optional[Union[str, Path]],
+    max_entries: Optional[int] = 10_000,
+    max_bytes: Optional[int] = 128 * 1024 * 1024,
+) -> None:
+    """Cache API GET responses under directory (None turns the cache off)."""
+    global _HTTP_CACHE
+    if _HTTP_CACHE is not None:
+        _HTTP_CACHE.close()
+    _HTTP_CACHE = (
+        HttpCache(directory, max_entries=max_entries, max_bytes=max_bytes)
+        if directory is not None
+        else None
+    )
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    return _HTTP_CACHE
+
+
+def http_cache_stats() -> Dict[str, int]:
+    """Fresh hits, revalidations and full fetches of the active HTTP cache (empty if off)."""
+    return _HTTP_CACHE.stats() if _HTTP_CACHE is not None else {}
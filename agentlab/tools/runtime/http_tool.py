@@ -1,10 +1,113 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, Optional
+import asyncio
+import atexit
+import importlib.util
+import threading
+import weakref
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Mapping, Optional, Tuple
 from urllib.parse import urlencode
 
 import httpx
 
+from .http_cache import CachedResponse, HttpCache, get_http_cache
+from .projection import ResponseLimits, read_capped, shape_body
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """Connection limits and timeouts (seconds) for pooled API tool clients."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 20.0
+    http2: bool = True  # used only when the optional h2 package is installed
+
+
+_HTTP_POOL_CONFIG = HttpPoolConfig()
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_CLIENTS: Dict[str, httpx.Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def configure_http_pool(**overrides: Any) -> HttpPoolConfig:
+    """Update pool settings; applies to clients created after the call."""
+    global _HTTP_POOL_CONFIG
+    _HTTP_POOL_CONFIG = replace(_HTTP_POOL_CONFIG, **overrides)
+    return _HTTP_POOL_CONFIG
+
+
+def _client_timeout(cfg: HttpPoolConfig) -> httpx.Timeout:
+    return httpx.Timeout(cfg.read_timeout, connect=cfg.connect_timeout)
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    """Return the keep-alive client shared by every tool calling base_url."""
+    key = base_url.rstrip("/")
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or client.is_closed:
+            cfg = _HTTP_POOL_CONFIG
+            client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=cfg.max_connections,
+                    max_keepalive_connections=cfg.max_keepalive_connections,
+                    keepalive_expiry=cfg.keepalive_expiry,
+                ),
+                timeout=_client_timeout(cfg),
+                http2=cfg.http2 and _HTTP2_AVAILABLE,
+            )
+            _CLIENTS[key] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close all pooled clients (end of a run or batch); later calls reopen them lazily."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_http_clients)
+
+# AsyncClient connections are bound to their event loop: one client per (loop, base URL)
+_LoopClients = Dict[str, httpx.AsyncClient]
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_http_client(base_url: str) -> httpx.AsyncClient:
+    """Async counterpart of get_http_client, scoped to the running event loop."""
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    key = base_url.rstrip("/")
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        cfg = _HTTP_POOL_CONFIG
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+            timeout=_client_timeout(cfg),
+            http2=cfg.http2 and _HTTP2_AVAILABLE,
+        )
+        clients[key] = client
+    return client
+
+
+async def aclose_http_clients() -> None:
+    """Close the async clients opened on the running event loop."""
+    clients = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
 
 def build_url(
     base_url: str, path: str, path_params: Mapping[str, Any] | None, query: Mapping[str, Any] | None
@@ -31,20 +134,97 @@ def http_call(
     path_params: Optional[Mapping[str, Any]] = None,
     query: Optional[Mapping[str, Any]] = None,
     json_body: Optional[Any] = None,
-    timeout: float = 20.0,
+    timeout: Optional[float] = None,
     client: Optional[httpx.Client] = None,
+    limits: Optional[ResponseLimits] = None,
 ) -> str:
+    """Perform one API call and return the body (JSON re-serialized for stable output).
+
+    Without ``client`` the pooled keep-alive client for ``base_url`` is used. ``timeout``
+    overrides the pool's read timeout for this call. The body is streamed; with ``limits`` it is
+    cut off early, then projected and capped (see ResponseLimits). GET calls go through the HTTP
+    cache when one is enabled (see enable_http_cache).
+    """
     url = build_url(base_url, path, path_params, query)
     _headers = dict(headers or {})
-    _client = client or httpx.Client(timeout=timeout)
-    try:
-        resp = _client.request(method.upper(), url, headers=_headers, json=json_body)
+    _client = client or get_http_client(base_url)
+    _timeout = httpx.Timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT
+    cache, key, entry = _cache_lookup(method, url, _headers)
+    if cache is not None and entry is not None and entry.fresh:
+        cache.hit()
+        return shape_body(entry.body, True, limits)
+    with _client.stream(
+        method.upper(),
+        url,
+        headers={**_headers, **entry.validators()} if entry is not None else _headers,
+        json=json_body,
+        timeout=_timeout,
+    ) as resp:
+        if cache is not None and entry is not None and resp.status_code == 304:
+            return shape_body(cache.revalidated(key, entry, resp.headers), True, limits)
         resp.raise_for_status()
-        try:
-            data = resp.json()
-            return httpx.Response(200, json=data).text  # stable JSON serialization
-        except ValueError:
-            return resp.text
-    finally:
-        if client is None:
-            _client.close()
+        body, complete = read_capped(resp.iter_bytes(), _read_cap(limits))
+    if cache is not None:
+        cache.fetched(key, body if complete else None, resp.headers)
+    return shape_body(body, complete, limits)
+
+
+async def ahttp_call(
+    method: str,
+    base_url: str,
+    path: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    path_params: Optional[Mapping[str, Any]] = None,
+    query: Optional[Mapping[str, Any]] = None,
+    json_body: Optional[Any] = None,
+    timeout: Optional[float] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    limits: Optional[ResponseLimits] = None,
+) -> str:
+    """Async http_call over the loop's pooled AsyncClient, so API tools never block the loop."""
+    url = build_url(base_url, path, path_params, query)
+    _headers = dict(headers or {})
+    _client = client or get_async_http_client(base_url)
+    _timeout = httpx.Timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT
+    cache, key, entry = _cache_lookup(method, url, _headers)
+    if cache is not None and entry is not None and entry.fresh:
+        cache.hit()
+        return shape_body(entry.body, True, limits)
+    async with _client.stream(
+        method.upper(),
+        url,
+        headers={**_headers, **entry.validators()} if entry is not None else _headers,
+        json=json_body,
+        timeout=_timeout,
+    ) as resp:
+        if cache is not None and entry is not None and resp.status_code == 304:
+            return shape_body(cache.revalidated(key, entry, resp.headers), True, limits)
+        resp.raise_for_status()
+        body, complete = await _aread_capped(resp, _read_cap(limits))
+    if cache is not None:
+        cache.fetched(key, body if complete else None, resp.headers)
+    return shape_body(body, complete, limits)
+
+
+def _cache_lookup(
+    method: str, url: str, headers: Dict[str, str]
+) -> Tuple[Optional[HttpCache], str, Optional[CachedResponse]]:
+    cache = get_http_cache() if method.upper() == "GET" else None
+    if cache is None:
+        return None, "", None
+    key = cache.key(url, headers)
+    return cache, key, cache.get(key)
+
+
+def _read_cap(limits: Optional[ResponseLimits]) -> Optional[int]:
+    return limits.read_cap() if limits is not None else None
+
+
+async def _aread_capped(resp: httpx.Response, cap: Optional[int]) -> Tuple[bytes, bool]:
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes():
+        buf += chunk
+        if cap is not None and len(buf) > cap:
+            return bytes(buf[:cap]), False
+    return bytes(buf), True
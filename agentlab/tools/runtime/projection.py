@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import orjson
+
+# Body read limit when a projection needs the complete document to parse
+DEFAULT_MAX_READ_BYTES = 16 * 1024 * 1024
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ResponseLimits:
+    """How much of an API response may reach the prompt.
+
+    ``fields`` keeps only the given paths (``items.name``, ``$.data[*].id``; on a list, a path
+    applies to every element), ``max_items`` keeps the first N items of every array, and
+    ``max_bytes`` caps the final text. Without a projection the body is read only up to
+    ``max_bytes``; with one, up to ``max_read_bytes`` so it can still be parsed.
+    """
+
+    max_bytes: Optional[int] = None
+    fields: Optional[Tuple[str, ...]] = None
+    max_items: Optional[int] = None
+    max_read_bytes: int = DEFAULT_MAX_READ_BYTES
+
+    @property
+    def projects(self) -> bool:
+        return bool(self.fields) or self.max_items is not None
+
+    def read_cap(self) -> Optional[int]:
+        """Bytes to read before cutting the response stream off (None = all)."""
+        if self.projects:
+            return self.max_read_bytes
+        return self.max_bytes
+
+    @classmethod
+    def from_options(
+        cls,
+        max_bytes: Any = None,
+        fields: Union[str, Sequence[str], None] = None,
+        max_items: Any = None,
+        base: Optional["ResponseLimits"] = None,
+    ) -> Optional["ResponseLimits"]:
+        """Build limits from loose option values (template strings, comma lists) over base.
+
+        Values that are not non-negative integers (e.g. ``_max_bytes: "abc"`` from an LLM-filled
+        ``with:``) are ignored in favour of base.
+        """
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        current = base or cls()
+        limits = cls(
+            max_bytes=_as_count(max_bytes, current.max_bytes),
+            fields=tuple(fields) if fields else current.fields,
+            max_items=_as_count(max_items, current.max_items),
+            max_read_bytes=current.max_read_bytes,
+        )
+        return None if limits == cls() else limits
+
+
+def _as_count(value: Any, default: Optional[int]) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return default
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        return default
+    return count if count >= 0 else default
+
+
+def read_capped(chunks: Iterable[bytes], cap: Optional[int]) -> Tuple[bytes, bool]:
+    """Join chunks until cap bytes; returns (body, complete). Stops pulling once over the cap."""
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        if cap is not None and len(buf) > cap:
+            return bytes(buf[:cap]), False
+    return bytes(buf), True
+
+
+def shape_body(body: bytes, complete: bool, limits: Optional[ResponseLimits]) -> str:
+    """Render a (possibly cut-off) response body as prompt text within limits.
+
+    A complete JSON body is parsed, projected if requested and re-serialized compactly, so
+    pretty-printed responses do not spend prompt space on whitespace; projection works on the
+    parsed document, not while streaming. Other text is passed through as received. A cut-off
+    text ends with a truncation marker, which counts against ``max_bytes``.
+    """
+    text: Optional[str] = None
+    if complete:
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            if limits is not None and limits.projects:
+                data = project(data, limits.fields, limits.max_items)
+            text = orjson.dumps(data).decode()
+    if text is None:
+        text = body.decode("utf-8", errors="ignore" if not complete else "replace")
+    max_bytes = limits.max_bytes if limits is not None else None
+    encoded = text.encode()
+    if complete and (max_bytes is None or len(encoded) <= max_bytes):
+        return text
+    if max_bytes is None:
+        return f"{text} …[truncated to {len(encoded)} bytes]"
+    marker = f" …[truncated to {max_bytes} bytes]"
+    room = max_bytes - len(marker.encode())
+    if room <= 0:
+        return encoded[:max_bytes].decode("utf-8", errors="ignore")  # no space for the marker
+    return encoded[:room].decode("utf-8", errors="ignore") + marker
+
+
+def parse_path(path: str) -> List[str]:
+    """Split ``$.data[*].id`` / ``data.*.id`` into ``["data", "*", "id"]``."""
+    path = path.strip()
+    if path.startswith("$"):
+        path = path[1:]
+    path = path.replace("[*]", ".*").replace("[", ".").replace("]", "")
+    return [part for part in path.split(".") if part]
+
+
+def project(
+    data: Any, fields: Optional[Sequence[str]] = None, max_items: Optional[int] = None
+) -> Any:
+    """Keep the first max_items of each array, then only the selected field paths."""
+    if max_items is not None:
+        data = _limit_items(data, max_items)
+    if fields:
+        selected = _select(data, [parse_path(f) for f in fields])
+        data = None if selected is _MISSING else selected
+    return data
+
+
+def _limit_items(node: Any, max_items: int) -> Any:
+    if isinstance(node, list):
+        return [_limit_items(item, max_items) for item in node[:max_items]]
+    if isinstance(node, dict):
+        return {k: _limit_items(v, max_items) for k, v in node.items()}
+    return node
+
+
+def _select(node: Any, paths: List[List[str]]) -> Any:
+    if any(not p for p in paths):
+        return node  # a path ends here: keep the whole subtree
+    if isinstance(node, list):
+        rest = [p[1:] if p[0] == "*" else p for p in paths]
+        items = (_select(item, rest) for item in node)
+        return [item for item in items if item is not _MISSING]
+    if isinstance(node, dict):
+        out = {}
+        for key, sub in _group_by_head(paths):
+            if key == "*":
+                for k, v in node.items():
+                    value = _select(v, sub)
+                    if value is not _MISSING:
+                        out[k] = value
+            elif key in node:
+                value = _select(node[key], sub)
+                if value is not _MISSING:
+                    out[key] = value
+        return out
+    return _MISSING
+
+
+def _group_by_head(paths: List[List[str]]) -> Iterator[Tuple[str, List[List[str]]]]:
+    groups: dict[str, List[List[str]]] = {}
+    for p in paths:
+        groups.setdefault(p[0], []).append(p[1:])
+    return iter(groups.items())
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import orjson
+
+
+@dataclass
+class Span:
+    """One timed region (monotonic clock) with free-form attributes."""
+
+    name: str
+    id: int
+    parent: Optional[int]
+    start: float
+    end: Optional[float] = None
+    lane: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Tracer:
+    """Collects spans for everything running under ``trace()``, across tasks and threads."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+
+    def new_span(self, name: str, parent: Optional[Span], attrs: Dict[str, Any]) -> Span:
+        sp = Span(
+            name=name,
+            id=next(self._ids),
+            parent=parent.id if parent else None,
+            start=time.perf_counter(),
+            lane=_lane(),
+            attrs=attrs,
+        )
+        self.spans.append(sp)
+        return sp
+
+    def timings(self, root: Span) -> Dict[str, Any]:
+        """Summarize ``root`` and its descendants as offsets/durations in milliseconds."""
+        children: Dict[Optional[int], List[Span]] = {}
+        for sp in self.spans:
+            children.setdefault(sp.parent, []).append(sp)
+        out: List[Dict[str, Any]] = []
+
+        def _walk(sp: Span, depth: int) -> None:
+            for child in children.get(sp.id, []):
+                out.append(
+                    {
+                        "name": child.name,
+                        "depth": depth,
+                        "start_ms": _ms(child.start - root.start),
+                        "duration_ms": _ms(child.duration),
+                        **child.attrs,
+                    }
+                )
+                _walk(child, depth + 1)
+
+        _walk(root, 0)
+        return {"total_ms": _ms(root.duration), "spans": out}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Export finished spans as Chrome trace events (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": sp.name,
+                "ph": "X",
+                "ts": round((sp.start - self.origin) * 1e6, 3),
+                "dur": round(sp.duration * 1e6, 3),
+                "pid": pid,
+                "tid": sp.lane,
+                "args": sp.attrs,
+            }
+            for sp in self.spans
+            if sp.end is not None
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> None:
+        Path(path).write_bytes(orjson.dumps(self.to_chrome_trace(), default=str))
+
+
+_TRACER: ContextVar[Optional[Tracer]] = ContextVar("agentlab_tracer", default=None)
+_CURRENT: ContextVar[Optional[Span]] = ContextVar("agentlab_span", default=None)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _lane() -> int:
+    # Concurrent tasks on one thread get their own lane so trace viewers nest spans correctly
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _TRACER.get()
+
+
+@contextmanager
+def trace(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Record spans from this context (and tasks/threads started from it) into a tracer."""
+    tracer = tracer or Tracer()
+    token = _TRACER.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _TRACER.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time a region as a child of the current span; yields None when no tracer is active."""
+    tracer = _TRACER.get()
+    if tracer is None:
+        yield None
+        return
+    sp = tracer.new_span(name, _CURRENT.get(), attrs)
+    token = _CURRENT.set(sp)
+    try:
+        yield sp
+    finally:
+        sp.end = time.perf_counter()
+        _CURRENT.reset(token)
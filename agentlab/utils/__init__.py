@@ -1,3 +1,5 @@
 __all__ = [
+    "jsonl",
     "templates",
+    "yamlio",
 ]
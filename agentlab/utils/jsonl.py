@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+import orjson
+
+
+@dataclass(frozen=True)
+class InvalidLine:
+    """Yielded by iter_jsonl in place of a line that is not valid JSON."""
+
+    lineno: int
+    error: str
+
+
+def iter_jsonl(source: Union[str, Path]) -> Iterator[Any]:
+    """Lazily decode one JSON value per line from a file, or from stdin when source is '-'.
+
+    Blank lines are skipped; a malformed line yields an InvalidLine naming its line number, so
+    one bad record does not end the stream.
+    """
+    if str(source) == "-":
+        yield from _decode_lines(sys.stdin.buffer)
+        return
+    with Path(source).open("rb") as fh:
+        yield from _decode_lines(fh)
+
+
+def _decode_lines(lines: Any) -> Iterator[Any]:
+    for lineno, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        try:
+            yield orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            yield InvalidLine(lineno, f"Invalid JSON on line {lineno}: {e}")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize obj as a single newline-terminated JSONL record."""
+    return orjson.dumps(obj, default=str) + b"\n"
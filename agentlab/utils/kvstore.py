@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+DEFAULT_CACHE_DIR = Path(os.getenv("AGENTLAB_CACHE_DIR", ".agentlab/cache"))
+
+
+class SQLiteStore:
+    """Small persistent key/value store (bytes values) backed by a single SQLite file.
+
+    Entries older than ``ttl`` seconds are treated as missing. After each write the least recently
+    used entries are evicted until the store fits ``max_entries`` and ``max_bytes``. Safe to share
+    across threads; WAL mode lets several processes use the same file.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS kv_accessed ON kv(accessed)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM kv WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE kv SET accessed = ? WHERE key = ?", (now, key))
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM kv"
+            ).fetchone()
+        return {"entries": int(count), "bytes": int(size)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self.stats()["entries"]
+
+    def _evict(self) -> None:
+        if self.max_entries is not None:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM kv").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM kv WHERE key IN"
+                    " (SELECT key FROM kv ORDER BY accessed ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+        if self.max_bytes is not None:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM kv").fetchone()
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, size in self._conn.execute("SELECT key, size FROM kv ORDER BY accessed ASC"):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key,))
+                total -= size
+            self._conn.executemany("DELETE FROM kv WHERE key = ?", victims)
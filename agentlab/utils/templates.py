@@ -1,20 +1,80 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..tracing import span
+
+Renderer = Callable[[Dict[str, Any]], Any]
 
 
 def _lookup_variable(path: str, variables: Dict[str, Any]) -> Any:
     """Resolve dotted paths like 'a.b.c' within variables dict; fallback to raw marker."""
-    if path in variables:
-        return variables[path]
-    parts = path.split(".")
-    cur: Any = variables
-    for part in parts:
-        if isinstance(cur, dict) and part in cur:
-            cur = cur[part]
-        else:
-            return f"{{{{{path}}}}}"
-    return cur
+    return _compile_accessor(path)(variables)
+
+
+@lru_cache(maxsize=1024)
+def _compile_accessor(path: str) -> Renderer:
+    """Pre-split a dotted path once; the returned accessor resolves it against variables.
+
+    Accessors are cached by path (bounded LRU), so _lookup_variable does not rebuild one per call.
+    """
+    parts = tuple(path.split("."))
+    marker = f"{{{{{path}}}}}"
+
+    def _get(variables: Dict[str, Any]) -> Any:
+        if path in variables:
+            return variables[path]
+        cur: Any = variables
+        for part in parts:
+            if isinstance(cur, dict) and part in cur:
+                cur = cur[part]
+            else:
+                return marker
+        return cur
+
+    return _get
+
+
+class CompiledTemplate:
+    """A template parsed once into (literal, accessor) segments plus a literal tail."""
+
+    __slots__ = ("source", "_segments", "_tail")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        segments: List[Tuple[str, Renderer]] = []
+        tail = ""
+        i = 0
+        while i < len(source):
+            start = source.find("{{", i)
+            if start == -1:
+                tail = source[i:]
+                break
+            end = source.find("}}", start + 2)
+            if end == -1:
+                # unmatched, keep the rest verbatim
+                tail = source[i:]
+                break
+            key = source[start + 2 : end].strip()
+            segments.append((source[i:start], _compile_accessor(key)))
+            i = end + 2
+        self._segments = tuple(segments)
+        self._tail = tail
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        parts: List[str] = []
+        for literal, get in self._segments:
+            parts.append(literal)
+            parts.append(str(get(variables)))
+        parts.append(self._tail)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """Parse a template once; results are cached by template string (bounded LRU)."""
+    return CompiledTemplate(template)
 
 
 def render_template(template: str, variables: Dict[str, Any]) -> str:
@@ -23,43 +83,69 @@ def render_template(template: str, variables: Dict[str, Any]) -> str:
     Replaces occurrences of {{var}} with variables[var] if present; otherwise leaves as-is.
     This is intentionally minimal to avoid bringing in a templating engine.
     """
-    result = []
-    i = 0
-    while i < len(template):
-        start = template.find("{{", i)
-        if start == -1:
-            result.append(template[i:])
-            break
-        result.append(template[i:start])
-        end = template.find("}}", start + 2)
-        if end == -1:
-            # unmatched, append rest
-            result.append(template[start:])
-            break
-        key = template[start + 2 : end].strip()
-        value = _lookup_variable(key, variables)
-        result.append(str(value))
-        i = end + 2
-    return "".join(result)
+    if "{{" not in template:
+        return template
+    return compile_template(template).render(variables)
+
+
+class CompiledMapping:
+    """A ``with:`` mapping compiled into one render function, reusable across runs."""
+
+    __slots__ = ("source", "_render", "_keys")
+
+    def __init__(self, mapping: Dict[str, Any]) -> None:
+        self.source = mapping
+        self._render = _compile_dict(mapping)
+        self._keys = len(mapping)
+
+    def render(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        with span("render_mapping", keys=self._keys):
+            return self._render(variables)
+
+
+def compile_mapping(mapping: Dict[str, Any]) -> CompiledMapping:
+    """Compile a mapping so rendering only walks its template-bearing values."""
+    return CompiledMapping(mapping)
 
 
 def render_mapping(mapping: Dict[str, Any], variables: Dict[str, Any]) -> Dict[str, Any]:
     """Render a dict by applying render_template to any string values recursively."""
-    rendered: Dict[str, Any] = {}
-    for k, v in mapping.items():
-        if isinstance(v, str):
-            rendered[k] = render_template(v, variables)
-        elif isinstance(v, dict):
-            rendered[k] = render_mapping(v, variables)
-        elif isinstance(v, list):
-            rendered[k] = [
-                (
-                    render_mapping(i, variables)
-                    if isinstance(i, dict)
-                    else (render_template(i, variables) if isinstance(i, str) else i)
-                )
-                for i in v
-            ]
-        else:
-            rendered[k] = v
-    return rendered
+    return compile_mapping(mapping).render(variables)
+
+
+def _constant(value: Any) -> Renderer:
+    return lambda _variables: value
+
+
+def _compile_str(value: str) -> Renderer:
+    if "{{" not in value:
+        return _constant(value)
+    return compile_template(value).render
+
+
+def _compile_dict(mapping: Dict[str, Any]) -> Renderer:
+    fields = [(k, _compile_value(v)) for k, v in mapping.items()]
+
+    def _render(variables: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: fn(variables) for k, fn in fields}
+
+    return _render
+
+
+def _compile_value(value: Any) -> Renderer:
+    if isinstance(value, str):
+        return _compile_str(value)
+    if isinstance(value, dict):
+        return _compile_dict(value)
+    if isinstance(value, list):
+        # List items: dicts recurse, strings render, anything else passes through
+        items = [
+            (
+                _compile_dict(i)
+                if isinstance(i, dict)
+                else (_compile_str(i) if isinstance(i, str) else _constant(i))
+            )
+            for i in value
+        ]
+        return lambda variables: [fn(variables) for fn in items]
+    return _constant(value)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Any, Union
+
+import yaml
+
+# libyaml's C loader parses several times faster; fall back to pure Python when PyYAML was built
+# without it
+SafeLoader: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def safe_load(stream: Union[str, bytes]) -> Any:
+    """``yaml.safe_load`` using the C loader when available."""
+    return yaml.load(stream, Loader=SafeLoader)
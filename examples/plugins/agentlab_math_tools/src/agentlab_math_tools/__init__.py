@@ -1,3 +1,3 @@
-from .tools import add, get_tools, multiply
+from .tools import add, count_primes, get_tools, multiply
 
-__all__ = ["add", "multiply", "get_tools"]
+__all__ = ["add", "multiply", "count_primes", "get_tools"]
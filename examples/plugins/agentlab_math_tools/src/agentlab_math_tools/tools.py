@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Dict
 
+from agentlab.tools.base import tool
+
 
 def add(x: int, y: int) -> int:
     return int(x) + int(y)
@@ -11,8 +13,16 @@ def multiply(x: int, y: int) -> int:
     return int(x) * int(y)
 
 
+@tool(cpu_bound=True, cacheable=True)
+def count_primes(n: int) -> int:
+    """Count primes below n by trial division; deliberately CPU-heavy."""
+    limit = int(n)
+    return sum(1 for k in range(2, limit) if all(k % d for d in range(2, int(k**0.5) + 1)))
+
+
 def get_tools() -> Dict[str, object]:
     return {
         "add": add,
         "multiply": multiply,
+        "count_primes": count_primes,
     }
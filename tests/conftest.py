@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+# Keep on-disk caches (e.g. compiled OpenAPI specs) out of the working tree
+os.environ.setdefault("AGENTLAB_CACHE_DIR", tempfile.mkdtemp(prefix="agentlab-test-cache-"))
+
+import pytest
+
+from agentlab.tools.registry import reset_plugin_discovery
+
+
+@pytest.fixture(autouse=True)
+def _fresh_plugin_discovery():
+    # Tests fake entry points per test; let each one rediscover them
+    reset_plugin_discovery()
+    yield
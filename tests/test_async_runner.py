@@ -0,0 +1,28 @@
+import asyncio
+
+import httpx
+
+from agentlab.config_loader import Blueprint
+from agentlab.runner import arun_agent
+
+
+def test_arun_agent_shares_injected_client(monkeypatch):
+    bp = Blueprint(name="async-agent", plan=[{"step": "generate", "name": "final"}])
+    clients = []
+
+    async def fake_acomplete(prompt: str, client=None, **_):
+        clients.append(client)
+        return "ok"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+
+    async def main():
+        async with httpx.AsyncClient() as client:
+            runs = [arun_agent(bp, input_text=str(i), client=client) for i in range(3)]
+            return client, await asyncio.gather(*runs)
+
+    client, results = asyncio.run(main())
+    assert [r["output"] for r in results] == ["ok", "ok", "ok"]
+    assert clients == [client, client, client]
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from agentlab.runner import _aexecute_tool
+from agentlab.tools.base import tool
+from agentlab.tools.executor import configure_tool_executor
+from agentlab.tools.registry import get_async_tool, register_tool
+
+
+def _execute_tool(name, args):
+    return asyncio.run(_aexecute_tool(name, args))
+
+
+def test_coroutine_tools_are_detected_and_awaited():
+    async def shout(text: str) -> str:
+        await asyncio.sleep(0)
+        return text.upper()
+
+    class Echo:
+        async def __call__(self, input: str) -> str:
+            return f"echo {input}"
+
+    register_tool("async.shout", shout)
+    register_tool("async.echo", Echo())
+    register_tool("sync.lambda", lambda text: shout(text))
+    assert get_async_tool("async.shout") is shout
+    assert get_async_tool("async.echo") is not None
+
+    assert _execute_tool("async.shout", {"text": "hi"}) == "HI"
+    assert _execute_tool("async.echo", {"input": "x"}) == "echo x"
+    assert _execute_tool("async.echo", {"other": 1, "input": "y"}) == "echo y"
+    assert _execute_tool("sync.lambda", {"text": "ok"}) == "OK"
+
+
+def test_tool_timeout_returns_error():
+    @tool(timeout=0.05)
+    async def stuck() -> str:
+        await asyncio.sleep(5)
+        return "never"
+
+    @tool(timeout=0.05)
+    def slow_sync() -> str:
+        time.sleep(0.3)
+        return "late"
+
+    register_tool("async.stuck", stuck)
+    register_tool("sync.slow", slow_sync)
+    assert (
+        _execute_tool("async.stuck", {}) == "[tool-error] Tool timed out after 0.05s: async.stuck"
+    )
+    assert _execute_tool("sync.slow", {}).startswith("[tool-error] Tool timed out")
+
+
+def test_sync_tools_share_bounded_pool():
+    configure_tool_executor(max_workers=2)
+    try:
+
+        def nap() -> str:
+            time.sleep(0.1)
+            return "ok"
+
+        register_tool("sync.nap", nap)
+
+        async def _many():
+            return await asyncio.gather(*(_aexecute_tool("sync.nap", {}) for _ in range(4)))
+
+        start = time.perf_counter()
+        assert asyncio.run(_many()) == ["ok"] * 4
+        assert time.perf_counter() - start >= 0.2  # two waves of two workers
+    finally:
+        configure_tool_executor(max_workers=8)
+
+
+def test_cli_exits_promptly_after_a_sync_tool_times_out(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    bp = tmp_path / "bp.yaml"
+    bp.write_text(
+        "name: hung\nplan:\n  - step: tool_use\n    name: hung.sleep\n  - step: generate\n"
+    )
+    script = (
+        "import time\n"
+        "from agentlab.cli import app\n"
+        "from agentlab.tools.base import tool\n"
+        "from agentlab.tools.registry import register_tool\n"
+        "register_tool('hung.sleep', tool(timeout=0.2)(lambda input: time.sleep(60)))\n"
+        f"app(['run', {str(bp)!r}, '-i', 'x'])\n"
+    )
+    env = {**os.environ, "AGENTLAB_TEST_MODE": "1"}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=45
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "timed out after 0.2s" in proc.stdout
+    assert time.perf_counter() - started < 20  # the sleeping tool is not joined at exit
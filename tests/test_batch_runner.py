@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from typer.testing import CliRunner
+
+from agentlab.cli import app
+from agentlab.config_loader import Blueprint
+from agentlab.runner import run_batch
+
+
+def _bp() -> Blueprint:
+    return Blueprint(name="batch-agent", plan=[{"step": "generate", "name": "final"}])
+
+
+def _patch_llm(monkeypatch, state):
+    async def fake_acomplete(prompt: str, **_):
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        # Later inputs finish first so completion order differs from input order
+        head = prompt.split("<user>\n")[1][0]
+        await asyncio.sleep(0.03 * (5 - int(head)) if head.isdigit() else 0)
+        state["inflight"] -= 1
+        return "done"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+
+
+def test_run_batch_ordered_and_bounded(monkeypatch):
+    state = {"inflight": 0, "peak": 0}
+    _patch_llm(monkeypatch, state)
+    seen = []
+    summary = run_batch(_bp(), ["0", "1", "2", "3", "4"], seen.append, concurrency=2)
+    assert [r["index"] for r in seen] == [0, 1, 2, 3, 4]
+    assert summary == {"agent": "batch-agent", "total": 5, "failed": 0}
+    assert state["peak"] == 2
+
+
+def test_run_batch_completion_order(monkeypatch):
+    state = {"inflight": 0, "peak": 0}
+    _patch_llm(monkeypatch, state)
+    seen = []
+    run_batch(_bp(), ["0", "1", "2", "3"], seen.append, concurrency=4, ordered=False)
+    assert [r["index"] for r in seen] == [3, 2, 1, 0]
+
+
+def test_batch_cli_writes_jsonl(monkeypatch, tmp_path):
+    state = {"inflight": 0, "peak": 0}
+    _patch_llm(monkeypatch, state)
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: cli-batch\nplan:\n  - step: generate\n")
+    inputs = tmp_path / "in.jsonl"
+    inputs.write_text('"1"\n\n{"title": "2"}\n')
+    out = tmp_path / "out.jsonl"
+    res = CliRunner().invoke(app, ["batch", str(bp_path), str(inputs), "-o", str(out)])
+    assert res.exit_code == 0, res.output
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["index"] for r in lines] == [0, 1]
+    assert lines[1]["input"] == {"title": "2"}
+    assert all(r["output"] == "done" for r in lines)
+
+
+def test_batch_cli_reports_malformed_lines_and_continues(monkeypatch, tmp_path):
+    state = {"inflight": 0, "peak": 0}
+    _patch_llm(monkeypatch, state)
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: cli-batch\nplan:\n  - step: generate\n")
+    inputs = tmp_path / "in.jsonl"
+    inputs.write_text('"1"\n{"title": \n"3"\n')
+    out = tmp_path / "out.jsonl"
+    res = CliRunner().invoke(app, ["batch", str(bp_path), str(inputs), "-o", str(out)])
+    assert res.exit_code == 0, res.output
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["index"] for r in lines] == [0, 1, 2]
+    assert lines[1]["line"] == 2
+    assert lines[1]["error"].startswith("Invalid JSON on line 2")
+    assert "error" not in lines[0] and "error" not in lines[2]
+    assert '"failed": 1' in res.output
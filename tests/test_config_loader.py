@@ -14,3 +14,69 @@ plan: []
     bp = load_blueprint(bp_path)
     assert isinstance(bp, Blueprint)
     assert bp.name == "t"
+
+
+def test_load_blueprint_cache(tmp_path: Path, monkeypatch):
+    import os
+
+    import agentlab.config_loader as cl
+
+    bp_path = tmp_path / "cached.yaml"
+    bp_path.write_text("name: first\nplan: []\n")
+    first = load_blueprint(bp_path, cache=True)
+    assert load_blueprint(bp_path, cache=True) is first  # unchanged file: same instance
+
+    bp_path.write_text("name: second\nplan: []\n")
+    os.utime(bp_path, ns=(1, 1))
+    assert load_blueprint(bp_path, cache=True).name == "second"
+
+    # A fresh process finds the validated blueprint on disk and skips parsing
+    cl._BLUEPRINT_MEMO.clear()
+    load_blueprint(bp_path, cache_dir=tmp_path / "cache")
+    cl._BLUEPRINT_MEMO.clear()
+    monkeypatch.setattr(cl, "_parse_blueprint", lambda data: (_ for _ in ()).throw(AssertionError))
+    assert load_blueprint(bp_path, cache_dir=tmp_path / "cache").name == "second"
+
+
+def test_load_blueprint_disk_cache_is_json_and_optional(tmp_path: Path):
+    import agentlab.config_loader as cl
+    from agentlab.utils.kvstore import SQLiteStore
+
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: plain\nplan:\n  - step: generate\n")
+    cl._BLUEPRINT_MEMO.clear()
+    load_blueprint(bp_path, cache_dir=tmp_path / "cache")
+    store = SQLiteStore(tmp_path / "cache" / "blueprints.sqlite3")
+    (key,) = [row[0] for row in store._conn.execute("SELECT key FROM kv")]
+    assert cl.Blueprint.model_validate_json(store.get(key)).name == "plain"
+    store.close()
+
+    # An unusable cache directory is a cache miss, not an error
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory")
+    cl._BLUEPRINT_MEMO.clear()
+    assert load_blueprint(bp_path, cache_dir=blocker / "cache").name == "plain"
+
+
+def test_cli_run_without_cache_flags_does_not_need_a_cache_dir(tmp_path: Path, monkeypatch):
+    from typer.testing import CliRunner
+
+    import agentlab.cli as cli
+    import agentlab.runner as R
+
+    async def fake_acomplete(prompt: str, **_):
+        return "done"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    (tmp_path / ".agentlab").write_text("a regular file, not a directory")
+    monkeypatch.setattr(cli, "DEFAULT_CACHE_DIR", tmp_path / ".agentlab" / "cache")
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: nocache\nplan:\n  - step: generate\n")
+
+    res = CliRunner().invoke(cli.app, ["run", str(bp_path), "-i", "hi"])
+    assert res.exit_code == 0, res.output
+    # An explicit but unusable --cache-dir only costs the blueprint cache
+    res = CliRunner().invoke(
+        cli.app, ["run", str(bp_path), "-i", "hi", "--cache-dir", str(tmp_path / ".agentlab")]
+    )
+    assert res.exit_code == 0, res.output
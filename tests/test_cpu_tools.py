@@ -0,0 +1,74 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+from agentlab.runner import _aexecute_tool
+from agentlab.tools.base import tool
+from agentlab.tools.executor import configure_tool_executor, is_picklable
+from agentlab.tools.registry import get_tool_options, load_plugin_tools, register_tool
+
+
+@tool(cpu_bound=True)
+def worker_pid(n: int) -> str:
+    return f"{sum(range(int(n)))} {os.getpid()}"
+
+
+def test_cpu_bound_tools_run_in_worker_process():
+    configure_tool_executor(max_processes=1)
+    try:
+        register_tool("cpu.pid", worker_pid)
+        out = asyncio.run(_aexecute_tool("cpu.pid", {"n": 10}))
+        total, pid = out.split()
+        assert total == "45" and int(pid) != os.getpid()
+
+        # Closures cannot be pickled, so they fall back to the thread pool
+        register_tool("cpu.local", tool(cpu_bound=True)(lambda n: f"{n} {os.getpid()}"))
+        assert not is_picklable(get_tool_options, lambda: None)
+        assert asyncio.run(_aexecute_tool("cpu.local", {"n": 1})) == f"1 {os.getpid()}"
+    finally:
+        configure_tool_executor(max_processes=None)
+
+
+def test_entry_point_extras_declare_cpu_bound(monkeypatch):
+    def heavy(x: int) -> int:
+        return x
+
+    ep = SimpleNamespace(name="heavy", extras=["cpu_bound"], load=lambda: heavy)
+    monkeypatch.setattr(
+        "agentlab.tools.registry.importlib_metadata.entry_points",
+        lambda: SimpleNamespace(select=lambda group: [ep]),
+    )
+    load_plugin_tools()
+    assert get_tool_options("heavy").cpu_bound
+
+
+def test_cli_exits_promptly_after_a_cpu_bound_tool_times_out(tmp_path):
+    import subprocess
+    import sys
+    import time
+
+    (tmp_path / "spin_plugin.py").write_text(
+        "from agentlab.tools.base import tool\n\n"
+        "@tool(cpu_bound=True, timeout=0.5)\n"
+        "def spin(input):\n"
+        "    while True:\n"
+        "        pass\n"
+    )
+    bp = tmp_path / "bp.yaml"
+    bp.write_text("name: spin\nplan:\n  - step: tool_use\n    name: cpu.spin\n  - step: generate\n")
+    script = (
+        "from agentlab.cli import app\n"
+        "from agentlab.tools.registry import register_tool\n"
+        "from spin_plugin import spin\n"
+        "register_tool('cpu.spin', spin)\n"
+        f"app(['run', {str(bp)!r}, '-i', 'x'])\n"
+    )
+    path = os.pathsep.join([str(tmp_path), os.getcwd(), os.environ.get("PYTHONPATH", "")])
+    env = {**os.environ, "AGENTLAB_TEST_MODE": "1", "PYTHONPATH": path}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "timed out after 0.5s" in proc.stdout
+    assert time.perf_counter() - started < 20  # the spinning worker was killed, not joined
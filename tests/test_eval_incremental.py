@@ -0,0 +1,107 @@
+import agentlab.runner as R
+from agentlab.config_loader import Blueprint
+from agentlab.eval_store import EvalResultStore, case_fingerprint
+from agentlab.evaluator import run_evaluations
+
+
+def _blueprint(**overrides) -> Blueprint:
+    data = {
+        "name": "inc",
+        "plan": [
+            {"step": "tool_use", "name": "echo", "with": {"text": "{{input}}"}},
+            {"step": "generate"},
+        ],
+        "evaluation": [
+            {"input": "a", "expected": "OK"},
+            {"input": "b", "expected": "OK"},
+        ],
+    }
+    data.update(overrides)
+    return Blueprint.model_validate(data)
+
+
+def test_fingerprint_tracks_what_shapes_the_output():
+    bp = _blueprint()
+    base = case_fingerprint(bp, "a", "m")
+    assert base == case_fingerprint(_blueprint(), "a", "m")
+    assert base != case_fingerprint(bp, "b", "m")
+    assert base != case_fingerprint(bp, "a", "other")
+    assert base != case_fingerprint(bp, "a", "m", {"temperature": 0.7})
+    assert base != case_fingerprint(_blueprint(system_prompt="Be terse."), "a", "m")
+    plan = [{"step": "tool_use", "name": "echo", "with": {"text": "x {{input}}"}}]
+    assert base != case_fingerprint(_blueprint(plan=plan + [{"step": "generate"}]), "a", "m")
+    # Checks are not part of the fingerprint
+    checks = [{"input": "a", "checks": [{"type": "contains", "value": "no"}]}]
+    assert base == case_fingerprint(_blueprint(evaluation=checks), "a", "m")
+
+
+def test_incremental_reuses_unchanged_cases(tmp_path, monkeypatch):
+    prompts = []
+
+    async def fake_acomplete(prompt: str, **_):
+        prompts.append(prompt)
+        return "OK"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    store = EvalResultStore(tmp_path)
+
+    first = run_evaluations(_blueprint(), "m", True, None, None, 1, None, store)
+    assert len(prompts) == 2
+    assert first["incremental"] == {"reused": 0, "rerun": 2}
+    assert [r["reused"] for r in first["results"]] == [False, False]
+
+    # Changed checks on case 0 and a new input on case 1: only case 1 generates again
+    evaluation = [
+        {"input": "a", "checks": [{"type": "contains", "value": "missing"}]},
+        {"input": "c", "expected": "OK"},
+    ]
+    second = run_evaluations(
+        _blueprint(evaluation=evaluation), "m", True, None, None, 1, None, store
+    )
+    assert len(prompts) == 3
+    assert second["incremental"] == {"reused": 1, "rerun": 1}
+    assert [r["reused"] for r in second["results"]] == [True, False]
+    assert [r["pass"] for r in second["results"]] == [False, True]
+    assert second["results"][0]["actual"] == "OK"
+    store.close()
+
+    # Without a store every case runs and results carry no reuse marker
+    plain = run_evaluations(_blueprint(), "m", True, None, None, 1)
+    assert len(prompts) == 5 and "incremental" not in plain
+    assert "reused" not in plain["results"][0]
+
+
+def test_broken_store_reruns_cases_instead_of_failing(tmp_path, monkeypatch):
+    async def fake_acomplete(prompt: str, **_):
+        return "OK"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    store = EvalResultStore(tmp_path)
+    store._store._conn.close()  # every store call now raises sqlite3.Error
+    summary = run_evaluations(_blueprint(), "m", True, None, None, 1, None, store)
+    assert summary["incremental"] == {"reused": 0, "rerun": 2}
+    assert [r["pass"] for r in summary["results"]] == [True, True]
+
+
+def test_cli_incremental_closes_its_store(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    from agentlab.cli import app
+
+    async def fake_acomplete(prompt: str, **_):
+        return "OK"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    closed = []
+    original = EvalResultStore.close
+    monkeypatch.setattr(EvalResultStore, "close", lambda self: closed.append(original(self)))
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text(
+        "name: inc-cli\nplan:\n  - step: generate\nevaluation:\n  - input: a\n    expected: OK\n"
+    )
+    argv = ["eval", str(bp_path), "--incremental", "--cache-dir", str(tmp_path / "c")]
+    for _ in range(2):
+        res = CliRunner().invoke(app, argv)
+        assert res.exit_code == 0, res.output
+    assert '"reused": 1' in res.output
+    assert len(closed) == 2
@@ -0,0 +1,90 @@
+import pytest
+
+import agentlab.runner as R
+from agentlab.config_loader import Blueprint
+from agentlab.eval_suite import SuiteOptions, merge_suite_shards, run_evaluation_suite
+from agentlab.evaluator import merge_shard_summaries, parse_shard, run_evaluations, shard_of
+
+
+def _blueprint(n: int = 12) -> Blueprint:
+    return Blueprint.model_validate(
+        {
+            "name": "sharded",
+            "plan": [{"step": "generate"}],
+            "evaluation": [
+                {"input": f"q{i}", "expected": "OK" if i % 3 else "nope"} for i in range(n)
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def ok_llm(monkeypatch):
+    async def fake_acomplete(prompt: str, **_):
+        return "OK"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "1/0", "x", "1/2/3"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_shard_of_is_stable_and_spreads_cases():
+    assert shard_of({"b": 1, "a": 2}, 3) == shard_of({"a": 2, "b": 1}, 3)
+    assert {shard_of(f"q{i}", 3) for i in range(30)} == {1, 2, 3}
+
+
+def test_shards_partition_cases_and_merge_to_full_run(ok_llm):
+    bp = _blueprint()
+    full = run_evaluations(bp, "m", True, None, None, 1)
+    parts = [run_evaluations(bp, "m", True, None, None, 2, (i, 3)) for i in (3, 1, 2)]
+
+    assert sum(p["total"] for p in parts) == 12
+    assert all(p["shard"]["count"] == 3 and p["shard"]["cases"] == 12 for p in parts)
+
+    merged = merge_shard_summaries(parts)
+    assert "shard" not in merged
+    assert (merged["total"], merged["passed"]) == (full["total"], full["passed"]) == (12, 8)
+    assert [r["case_index"] for r in merged["results"]] == list(range(12))
+    assert [r["pass"] for r in merged["results"]] == [r["pass"] for r in full["results"]]
+    assert merged["timing"]["wall_s"] == max(p["timing"]["wall_s"] for p in parts)
+
+
+def test_merge_rejects_missing_or_mismatched_shards(ok_llm):
+    bp = _blueprint(4)
+    one, two = (run_evaluations(bp, "m", True, None, None, 1, (i, 2)) for i in (1, 2))
+    with pytest.raises(ValueError, match="Expected shards"):
+        merge_shard_summaries([one, one])
+    with pytest.raises(ValueError, match="do not belong"):
+        merge_shard_summaries([one, {**two, "agent": "other"}])
+    with pytest.raises(ValueError, match="do not belong"):
+        merge_shard_summaries([run_evaluations(bp, "m", True, None, None, 1)])
+    # Shards of an edited blueprint: the case counts differ
+    longer = run_evaluations(_blueprint(6), "m", True, None, None, 1, (2, 2))
+    with pytest.raises(ValueError, match="do not belong"):
+        merge_shard_summaries([one, longer])
+    duplicated = {**two, "results": two["results"] + one["results"][:1]}
+    with pytest.raises(ValueError, match="same case"):
+        merge_shard_summaries([one, duplicated])
+
+
+def test_suite_shards_merge_per_blueprint(tmp_path, ok_llm):
+    paths = []
+    for name in ("alpha", "beta"):
+        p = tmp_path / f"{name}.yaml"
+        p.write_text(
+            f"name: {name}\nplan:\n  - step: generate\nevaluation:\n"
+            + "".join(f"  - input: q{i}\n    expected: OK\n" for i in range(5))
+        )
+        paths.append(p)
+    parts = [
+        run_evaluation_suite(paths, SuiteOptions(cache_dir=str(tmp_path), shard=(i, 2)), workers=1)
+        for i in (1, 2)
+    ]
+    merged = merge_suite_shards(parts)
+    assert [s["agent"] for s in merged["suites"]] == ["alpha", "beta"]
+    assert (merged["blueprints"], merged["total"], merged["passed"]) == (2, 10, 10)
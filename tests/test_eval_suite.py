@@ -0,0 +1,75 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from agentlab.eval_suite import (
+    SuiteOptions,
+    evaluate_blueprint_file,
+    resolve_blueprints,
+    run_evaluation_suite,
+)
+
+
+def _write_blueprints(tmp_path: Path) -> Path:
+    d = tmp_path / "bps"
+    d.mkdir()
+    for name, expected in (("alpha", "OK"), ("beta", "nope")):
+        (d / f"{name}.yaml").write_text(
+            f"name: {name}\nplan:\n  - step: generate\nevaluation:\n"
+            f"  - input: hi\n    expected: {expected}\n  - input: there\n    expected: OK\n"
+        )
+    (d / "broken.yml").write_text("name: [unclosed\n")
+    (d / "notes.txt").write_text("not a blueprint")
+    return d
+
+
+def test_resolve_blueprints(tmp_path):
+    d = _write_blueprints(tmp_path)
+    assert [p.name for p in resolve_blueprints(str(d))] == ["alpha.yaml", "beta.yaml", "broken.yml"]
+    assert [p.name for p in resolve_blueprints(str(d / "*.yaml"))] == ["alpha.yaml", "beta.yaml"]
+    assert resolve_blueprints(str(d / "missing.yaml")) == []
+
+
+def test_suite_runs_blueprints_in_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENTLAB_TEST_MODE", "1")  # workers answer "OK: test-mode response"
+    d = _write_blueprints(tmp_path)
+    junit = tmp_path / "suite.xml"
+    summary = run_evaluation_suite(
+        resolve_blueprints(str(d)),
+        SuiteOptions(concurrency=2, cache_dir=str(tmp_path / "cache")),
+        workers=2,
+        junit_path=str(junit),
+    )
+    assert [s["agent"] for s in summary["suites"]] == ["alpha", "beta", "broken"]
+    assert (summary["blueprints"], summary["total"], summary["passed"]) == (3, 4, 3)
+    assert summary["errors"][0]["path"].endswith("broken.yml")
+    assert summary["timing"]["workers"] == 2
+
+    root = ET.parse(junit).getroot()
+    assert root.tag == "testsuites" and root.get("tests") == "4" and root.get("failures") == "1"
+    suites = root.findall("testsuite")
+    assert [s.get("name") for s in suites] == ["alpha", "beta", "broken"]
+    assert suites[2].find("error") is not None
+
+
+def test_unavailable_cache_does_not_fail_a_blueprint(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENTLAB_TEST_MODE", "1")
+    d = _write_blueprints(tmp_path)
+    blocker = tmp_path / "blocker"
+    blocker.write_text("a file where the cache directory should be")
+    options = SuiteOptions(
+        cache_dir=str(blocker / "cache"), cache=True, http_cache=True, incremental=True
+    )
+
+    # TEST_MODE is read at import time, so stub the LLM for the in-process call
+    import agentlab.runner as R
+
+    async def fake_acomplete(prompt: str, **_):
+        return "OK"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    alone = evaluate_blueprint_file(str(d / "alpha.yaml"), options)
+    assert "error" not in alone and (alone["total"], alone["passed"]) == (2, 2)
+
+    summary = run_evaluation_suite(resolve_blueprints(str(d / "*.yaml")), options, workers=2)
+    assert summary["errors"] == []
+    assert (summary["total"], summary["passed"]) == (4, 3)
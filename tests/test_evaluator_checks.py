@@ -26,3 +26,58 @@ def test_evaluator_contains_regex_anyof(monkeypatch):
 
     summary = run_evaluations(bp)
     assert summary["passed"] == 3
+
+
+def test_evaluator_concurrency_keeps_order(monkeypatch, tmp_path):
+    import asyncio
+    import xml.etree.ElementTree as ET
+
+    bp = _bp_for_output("x")
+    state = {"inflight": 0, "peak": 0}
+
+    async def fake_acomplete(prompt: str, **_):
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        n = int(prompt.split("<user>\n")[1][0])
+        await asyncio.sleep(0.01 * (4 - n))
+        state["inflight"] -= 1
+        return f"answer {n}"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    bp.evaluation = [EvalCase(input=str(i), expected=f"answer {i}") for i in range(4)]
+
+    junit = tmp_path / "junit.xml"
+    summary = run_evaluations(bp, junit_path=str(junit), concurrency=3)
+    assert summary["passed"] == 4
+    assert [r["input"] for r in summary["results"]] == ["0", "1", "2", "3"]
+    assert state["peak"] == 3
+    assert summary["timing"]["wall_s"] < summary["timing"]["cases_s"]
+    suite = ET.parse(junit).getroot()
+    assert [c.get("name") for c in suite] == ["case_1", "case_2", "case_3", "case_4"]
+    assert all(c.get("time") for c in suite)
+
+
+def test_evaluator_aggregates_llm_metrics(monkeypatch):
+    from agentlab.llm.ollama_client import Completion, GenerationMetrics
+
+    bp = _bp_for_output("x")
+
+    async def fake_acomplete(prompt: str, **_):
+        cold = "cold" in prompt
+        metrics = GenerationMetrics(
+            prompt_eval_count=10, eval_count=20, eval_s=1.0, load_s=3.0 if cold else 0.0
+        )
+        return Completion("ok", metrics)
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    bp.evaluation = [EvalCase(input="cold", expected="ok"), EvalCase(input="warm", expected="ok")]
+
+    summary = run_evaluations(bp)
+    assert summary["results"][0]["llm"]["tokens_per_sec"] == 20.0
+    assert summary["llm"]["eval_tokens"] == 40
+    assert summary["llm"]["load_s_max"] == 3.0
+    assert summary["llm"]["prompt_tokens"] == 20
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+
+from agentlab.tools.runtime.http_cache import (
+    enable_http_cache,
+    get_http_cache,
+    http_cache_stats,
+    parse_cache_control,
+)
+from agentlab.tools.runtime.http_tool import ahttp_call, http_call
+
+
+def _server(headers, seen):
+    def handle(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+        return httpx.Response(200, json={"pets": ["a"]}, headers={"ETag": '"v1"', **headers})
+
+    return httpx.MockTransport(handle)
+
+
+def test_http_cache_honours_max_age_and_revalidates(tmp_path):
+    seen = []
+    client = httpx.Client(transport=_server({"Cache-Control": "max-age=0"}, seen))
+    enable_http_cache(tmp_path)
+    try:
+        call = lambda: http_call("GET", "https://api.example.com", "/pets", client=client)  # noqa: E731
+        assert call() == '{"pets":["a"]}'  # full fetch, stored (stale at once)
+        assert call() == '{"pets":["a"]}'  # revalidated: 304 with max-age=60
+        assert call() == '{"pets":["a"]}'  # fresh: no request at all
+        assert len(seen) == 2 and seen[1]["if-none-match"] == '"v1"'
+        assert http_cache_stats() == {"hits": 1, "revalidations": 1, "fetches": 1}
+
+        # Different credentials never share an entry; POSTs bypass the cache
+        http_call("GET", "https://api.example.com", "/pets", headers={"X-Key": "b"}, client=client)
+        http_call("POST", "https://api.example.com", "/pets", client=client)
+        assert http_cache_stats()["fetches"] == 2
+    finally:
+        enable_http_cache(None)
+    assert http_cache_stats() == {}
+
+
+def test_async_http_cache_skips_no_store(tmp_path):
+    seen = []
+    client = httpx.AsyncClient(transport=_server({"Cache-Control": "no-store"}, seen))
+    enable_http_cache(tmp_path)
+    try:
+
+        async def _twice():
+            for _ in range(2):
+                await ahttp_call("GET", "https://api.example.com", "/pets", client=client)
+            await client.aclose()
+
+        asyncio.run(_twice())
+        assert len(seen) == 2 and "if-none-match" not in seen[1]
+        assert http_cache_stats() == {"hits": 0, "revalidations": 0, "fetches": 2}
+    finally:
+        enable_http_cache(None)
+
+
+def test_broken_http_cache_store_falls_back_to_fetching(tmp_path):
+    seen = []
+    client = httpx.Client(transport=_server({"Cache-Control": "max-age=60"}, seen))
+    enable_http_cache(tmp_path)
+    try:
+        get_http_cache()._store._conn.close()  # every store call now raises sqlite3.Error
+        for _ in range(2):
+            assert http_call("GET", "https://api.example.com", "/pets", client=client) == (
+                '{"pets":["a"]}'
+            )
+        assert len(seen) == 2
+        assert http_cache_stats() == {"hits": 0, "revalidations": 0, "fetches": 2}
+    finally:
+        enable_http_cache(None)
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('Public, max-age="30", no-cache') == {
+        "public": None,
+        "max-age": "30",
+        "no-cache": None,
+    }
@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import pytest
+
+import agentlab.llm.ollama_client as oc
+
+
+def _generate_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"response": "pooled", "done": True})
+
+
+def test_pool_reuses_client_per_loop(monkeypatch):
+    monkeypatch.setattr(oc, "TEST_MODE", False)
+
+    async def main():
+        before = oc.pool_stats()
+        first = oc.get_client()
+        await first.aclose()
+        # Swap in a mock transport so acomplete exercises the pooled path offline
+        pooled = httpx.AsyncClient(transport=httpx.MockTransport(_generate_handler))
+        oc._POOL[asyncio.get_running_loop()] = pooled
+        text = await oc.acomplete("hi")
+        assert oc.get_client() is pooled
+        after = oc.pool_stats()
+        await oc.aclose_pool()
+        return before, after, text
+
+    before, after, text = asyncio.run(main())
+    assert text == "pooled"
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+
+def test_first_token_timeout(monkeypatch):
+    monkeypatch.setattr(oc, "TEST_MODE", False)
+    monkeypatch.setattr(oc, "_POOL_CONFIG", oc.PoolConfig(first_token_timeout=0.05))
+
+    class SlowStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            await asyncio.sleep(1)
+            yield b'{"response": "late"}\n'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=SlowStream())
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await oc.acomplete("hi", stream=True, client=client)
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(main())
+
+
+def test_ndjson_decoder_handles_split_records():
+    from agentlab.llm.ndjson import NDJSONDecoder
+
+    dec = NDJSONDecoder()
+    data = '{"response": "hé"}\n\n{"response": "llo"}\nnot json\n{"done": true}'.encode()
+    records = []
+    # Feed one byte at a time so records (and the UTF-8 sequence) straddle chunks
+    for i in range(len(data)):
+        records.extend(dec.feed(data[i : i + 1]))
+    records.extend(dec.close())
+    assert records == [{"response": "hé"}, {"response": "llo"}, {"done": True}]
+    assert dec.errors == 1
+
+
+def test_streaming_surfaces_tokens_and_done_record(monkeypatch):
+    monkeypatch.setattr(oc, "TEST_MODE", False)
+    body = (
+        b'{"response": "Hel"}\n{"respo'
+        + b'nse": "lo"}\n{"response": "", "done": true, "eval_count": 2}\n'
+    )
+
+    class Chunked(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for i in range(0, len(body), 7):
+                yield body[i : i + 7]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=Chunked())
+
+    tokens, done = [], []
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await oc.acomplete(
+                "hi", stream=True, client=client, on_token=tokens.append, on_done=done.append
+            )
+
+    assert asyncio.run(main()) == "Hello"
+    assert tokens == ["Hel", "lo"]
+    assert done[0]["eval_count"] == 2
+
+
+def test_return_result_carries_metrics(monkeypatch):
+    monkeypatch.setattr(oc, "TEST_MODE", False)
+    record = {
+        "response": "hi",
+        "done": True,
+        "prompt_eval_count": 12,
+        "prompt_eval_duration": 300_000_000,
+        "eval_count": 50,
+        "eval_duration": 2_000_000_000,
+        "load_duration": 1_500_000_000,
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=record)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await oc.acomplete("hi", client=client, return_result=True)
+
+    res = asyncio.run(main())
+    assert res.text == "hi"
+    assert res.metrics.eval_count == 50 and res.metrics.load_s == 1.5
+    assert res.metrics.as_dict()["tokens_per_sec"] == 25.0
+
+
+def test_cli_reports_pool_stats(monkeypatch, tmp_path):
+    import json
+
+    from typer.testing import CliRunner
+
+    from agentlab.cli import app
+
+    class OfflineClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(_generate_handler), **kwargs)
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", oc.acomplete)  # scaffolded blueprint tests replace it
+    monkeypatch.setattr(oc, "TEST_MODE", False)
+    monkeypatch.setattr(oc.httpx, "AsyncClient", OfflineClient)
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: pooled\nplan:\n  - step: generate\n")
+    before = oc.pool_stats()
+    res = CliRunner().invoke(app, ["run", str(bp_path), "-i", "hi"])
+    assert res.exit_code == 0, res.output
+    result = json.loads(res.output[res.output.index("{") :])
+    assert result["output"] == "pooled"
+    assert result["llm_pool"]["misses"] == before["misses"] + 1
@@ -42,3 +42,121 @@ def test_ingest_registers_tools(tmp_path: Path, monkeypatch):
     assert tool is not None
     out = tool(limit=2)
     assert "items" in out
+
+
+def test_http_call_reuses_pooled_client_per_base_url():
+    import agentlab.tools.runtime.http_tool as rt
+
+    first = rt.get_http_client("https://pool.example.com/")
+    assert rt.get_http_client("https://pool.example.com") is first
+    assert rt.get_http_client("https://other.example.com") is not first
+
+    # Swap in a mock transport for this base URL; http_call must pick it up without a client arg
+    first.close()
+    mocked = httpx.Client(transport=MockTransport())
+    rt._CLIENTS["https://pool.example.com"] = mocked
+    assert "items" in rt.http_call("GET", "https://pool.example.com", "/pets")
+    assert '"id":"7"' in rt.http_call(
+        "GET", "https://pool.example.com", "/pets/{id}", path_params={"id": 7}
+    )
+
+    rt.close_http_clients()
+    assert rt._CLIENTS == {}
+    assert mocked.is_closed
+
+
+def test_runner_prefers_async_path_for_api_tools(monkeypatch):
+    import asyncio
+
+    import agentlab.runner as R
+    import agentlab.tools.openapi.ingest as ing
+    import agentlab.tools.runtime.http_tool as rt
+    from agentlab.config_loader import Blueprint
+
+    ingest_openapi(
+        Path("tests/fixtures/petstore.yaml"), tag="apet", base_url_override="https://a.example.com"
+    )
+    tool = get_tool("apet.getPet")
+    assert tool is not None and hasattr(tool, "acall")
+
+    async_client = httpx.AsyncClient(transport=httpx.MockTransport(MockTransport().handle_request))
+    calls = []
+
+    async def ahttp_call_with_client(method: str, base_url: str, path: str, **kwargs: Any) -> str:
+        calls.append(path)
+        return await rt.ahttp_call(method, base_url, path, client=async_client, **kwargs)
+
+    def sync_forbidden(*args: Any, **kwargs: Any) -> str:
+        raise AssertionError("runner should use the async path")
+
+    async def fake_acomplete(prompt: str, **_):
+        return "ok"
+
+    monkeypatch.setattr(ing, "ahttp_call", ahttp_call_with_client)
+    monkeypatch.setattr(ing, "http_call", sync_forbidden)
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    bp = Blueprint(
+        name="api",
+        plan=[
+            {"step": "tool_use", "name": "apet.getPet", "with": {"id": 7}},
+            {"step": "generate"},
+        ],
+    )
+    out = R.run_agent(bp, input_text="")
+    assert calls == ["/pets/{id}"]
+    assert '"id":"7"' in out["tool_context"][0]
+    asyncio.run(async_client.aclose())
+
+
+def test_spec_index_is_cached_and_tools_built_lazily(tmp_path: Path, monkeypatch):
+    import agentlab.tools.openapi.ingest as ing
+    from agentlab.tools.registry import _TOOL_REGISTRY, LazyTool
+
+    spec = tmp_path / "spec.yaml"
+    spec.write_bytes(Path("tests/fixtures/petstore.yaml").read_bytes())
+    ing._INDEX_MEMO.clear()
+    names = ingest_openapi(spec, tag="lazy", cache_dir=tmp_path / "cache")
+    assert isinstance(_TOOL_REGISTRY["lazy.getPet"], LazyTool)
+    tool = get_tool("lazy.getPet")
+    assert isinstance(tool, ing.OpenAPITool) and tool.base_url == "https://example.com"
+    assert _TOOL_REGISTRY["lazy.getPet"] is tool
+
+    # A new process (empty memo) reuses the compiled index from disk without parsing
+    ing._INDEX_MEMO.clear()
+    monkeypatch.setattr(ing, "compile_spec", lambda spec: (_ for _ in ()).throw(AssertionError))
+    assert ingest_openapi(spec, tag="lazy", cache_dir=tmp_path / "cache") == names
+
+
+def test_remote_spec_index_revalidates_with_etag(tmp_path: Path, monkeypatch):
+    import agentlab.tools.openapi.ingest as ing
+
+    body = Path("tests/fixtures/petstore.yaml").read_bytes()
+    seen = []
+
+    def fake_get(url: str, timeout: float, headers: Any = None) -> httpx.Response:
+        seen.append((headers or {}).get("If-None-Match"))
+        request = httpx.Request("GET", url)
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, content=body, headers={"ETag": '"v1"'}, request=request)
+
+    monkeypatch.setattr(ing.httpx, "get", fake_get)
+    first = ing.load_spec_index("https://specs.example.com/pets.yaml", tmp_path)
+    second = ing.load_spec_index("https://specs.example.com/pets.yaml", tmp_path)
+    assert seen == [None, '"v1"']
+    assert second == first and len(first.operations) == 3
+
+
+def test_spec_cache_is_opt_in_and_fails_soft(tmp_path: Path, monkeypatch):
+    import agentlab.tools.openapi.ingest as ing
+
+    spec = Path("tests/fixtures/petstore.yaml").resolve()
+    monkeypatch.chdir(tmp_path)
+    ing._INDEX_MEMO.clear()
+    assert ingest_openapi(spec, tag="mem")  # no cache_dir: nothing written anywhere
+    assert list(tmp_path.iterdir()) == []
+
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory")
+    ing._INDEX_MEMO.clear()
+    assert ingest_openapi(spec, tag="soft", cache_dir=blocker / "cache")
@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from agentlab.config_loader import Blueprint
+from agentlab.runner import run_agent
+from agentlab.tools.registry import register_tool
+
+
+def test_independent_tool_steps_run_concurrently(monkeypatch):
+    barrier = threading.Barrier(3, timeout=2)
+
+    def lookup(key: str) -> str:
+        barrier.wait()  # only passes if all three lookups are in flight together
+        time.sleep(0.01 * (3 - int(key)))
+        return f"value-{key}"
+
+    register_tool("dag.lookup", lookup)
+
+    async def fake_acomplete(prompt: str, **_):
+        return "ok"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    bp = Blueprint(
+        name="dag",
+        plan=[
+            {
+                "step": "tool_use",
+                "id": f"l{i}",
+                "needs": [],
+                "name": "dag.lookup",
+                "with": {"key": str(i)},
+            }
+            for i in range(3)
+        ]
+        + [
+            {"step": "note", "needs": ["l0", "l2"], "with": {"msg": "joined"}},
+            {"step": "generate"},
+        ],
+    )
+    out = run_agent(bp, input_text="x")
+    assert out["tool_context"] == [
+        "[dag.lookup key=0] value-0",
+        "[dag.lookup key=1] value-1",
+        "[dag.lookup key=2] value-2",
+        "[note] {'msg': 'joined'}",
+    ]
+
+
+def test_plan_dependency_validation():
+    with pytest.raises(ValidationError, match="unknown step id"):
+        Blueprint(name="bad", plan=[{"step": "note", "needs": ["missing"]}])
+    with pytest.raises(ValidationError, match="cycle"):
+        Blueprint(
+            name="cyclic",
+            plan=[
+                {"step": "note", "id": "a", "needs": ["b"]},
+                {"step": "note", "id": "b", "needs": ["a"]},
+            ],
+        )
@@ -0,0 +1,100 @@
+import os
+import sys
+import textwrap
+from types import SimpleNamespace
+
+from agentlab.tools import registry
+from agentlab.tools.registry import (
+    enable_plugin_index,
+    get_tool,
+    get_tool_options,
+    load_plugin_tools,
+)
+
+
+def test_discovery_runs_once_until_refresh(monkeypatch):
+    scans = []
+
+    def fake_entry_points():
+        scans.append(1)
+        return SimpleNamespace(
+            select=lambda group: [SimpleNamespace(name="once", load=lambda: len)]
+        )
+
+    monkeypatch.setattr(
+        "agentlab.tools.registry.importlib_metadata.entry_points", fake_entry_points
+    )
+    load_plugin_tools()
+    load_plugin_tools()
+    assert len(scans) == 1 and get_tool("once") is len
+    load_plugin_tools(refresh=True)
+    assert len(scans) == 2
+
+
+def test_persisted_index_imports_plugins_lazily(monkeypatch, tmp_path):
+    pkg = tmp_path / "site"
+    pkg.mkdir()
+    (pkg / "lazy_plugin_mod.py").write_text(
+        textwrap.dedent(
+            """
+            from agentlab.tools.base import tool
+
+            @tool(cacheable=True)
+            def triple(x):
+                return int(x) * 3
+
+            def get_tools():
+                return {"lazy.triple": triple}
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(pkg))
+    ep = registry.importlib_metadata.EntryPoint(
+        name="lazy", value="lazy_plugin_mod:get_tools", group="agentlab.tools"
+    )
+    monkeypatch.setattr(
+        "agentlab.tools.registry.importlib_metadata.entry_points",
+        lambda: SimpleNamespace(select=lambda group: [ep]),
+    )
+    enable_plugin_index(tmp_path / "cache")
+    try:
+        load_plugin_tools()  # walks entry points and writes the index
+
+        # A fresh process: no module imported, entry points must not be scanned again
+        registry.reset_plugin_discovery()
+        registry._TOOL_REGISTRY.pop("lazy.triple")
+        monkeypatch.delitem(sys.modules, "lazy_plugin_mod")
+        monkeypatch.setattr(
+            "agentlab.tools.registry.importlib_metadata.entry_points",
+            lambda: (_ for _ in ()).throw(AssertionError("scanned entry points")),
+        )
+        load_plugin_tools()
+        assert get_tool_options("lazy.triple").cacheable
+        assert "lazy_plugin_mod" not in sys.modules
+        assert get_tool("lazy.triple")(2) == 6
+        assert "lazy_plugin_mod" in sys.modules
+    finally:
+        enable_plugin_index(None)
+
+
+def test_index_fingerprint_follows_distributions_not_the_working_dir(monkeypatch, tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    monkeypatch.syspath_prepend(str(site))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend("")
+    before = registry._distributions_fingerprint()
+
+    (tmp_path / "results.jsonl").write_text("{}\n")
+    (tmp_path / ".agentlab").mkdir()
+    assert registry._distributions_fingerprint() == before
+
+    info = site / "demo_plugin-1.0.dist-info"
+    info.mkdir()
+    (info / "METADATA").write_text("Metadata-Version: 2.1\nName: demo-plugin\nVersion: 1.0\n")
+    installed = registry._distributions_fingerprint()
+    assert installed != before
+
+    (info / "entry_points.txt").write_text("[agentlab.tools]\ndemo = demo_plugin:tool\n")
+    os.utime(info, ns=(1, 1))  # reinstall of an editable plugin: entry points rewritten
+    assert registry._distributions_fingerprint() != installed
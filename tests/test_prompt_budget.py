@@ -0,0 +1,71 @@
+import json
+
+from agentlab.config_loader import Blueprint
+from agentlab.prompt_budget import (
+    compact_entries,
+    dedupe_lines,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+from agentlab.runner import run_agent
+from agentlab.tools.registry import register_tool
+
+
+def test_estimator_and_truncation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens('{"id": 12, "name": "rex"}') == 15
+    assert estimate_tokens("internationalization") == 4
+    text = " ".join(f"word{i}" for i in range(500))
+    cut = truncate_to_tokens(text, 100)
+    assert estimate_tokens(cut) <= 100 and cut.endswith("tokens]")
+    assert truncate_to_tokens("short", 100) == "short"
+
+
+def test_compaction_dedupes_and_shares_budget_proportionally():
+    entries, removed = dedupe_lines(
+        ["[a] x\ncommon line\nonly a", "[b] y\ncommon line\ncommon line\n}\n}"]
+    )
+    assert entries == ["[a] x\ncommon line\nonly a", "[b] y\n}\n}"] and removed == 2
+
+    big, small = "alpha " * 600, "beta " * 200
+    out, stats = compact_entries([big, small], available_tokens=400)
+    sizes = [estimate_tokens(e) for e in out]
+    assert sum(sizes) <= 400 and sizes[0] > 2 * sizes[1]
+    assert stats.compacted_entries == 2 and stats.dropped_tokens >= 400
+    assert stats.dropped_bytes > 0
+
+
+def test_runner_applies_blueprint_budget(monkeypatch):
+    import agentlab.runner as R
+
+    register_tool("verbose.dump", lambda input: "row of data\n" * 5 + "payload " * 2000)
+    prompts = []
+
+    async def fake_acomplete(prompt: str, **_):
+        prompts.append(prompt)
+        return "ok"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    bp = Blueprint(
+        name="budget",
+        prompt_budget=300,
+        plan=[{"step": "tool_use", "name": "verbose.dump"}, {"step": "generate"}],
+    )
+    out = run_agent(bp, input_text="hi")
+    report = out["prompt_budget"]
+    assert estimate_tokens(prompts[0]) == report["prompt_tokens"] <= 300
+    assert report["deduped_lines"] == 3 and report["dropped_bytes"] > 10_000
+    assert "payload" in out["tool_context"][0] and len(out["tool_context"][0]) > 10_000
+
+
+def test_context_under_budget_is_untouched():
+    rows = [{"id": i, "name": "rex", "tags": ["a", "b"]} for i in range(3)]
+    pretty = "[api.list] " + json.dumps(rows, indent=2)
+    out, stats = compact_entries([pretty, pretty], available_tokens=10_000)
+    assert out == [pretty, pretty] and stats.deduped_lines == 0 and stats.compacted_entries == 0
+    assert json.loads(out[0].split(" ", 1)[1]) == rows
+
+    # Over budget, dedupe still keeps the JSON's structural lines
+    deduped, _ = dedupe_lines([pretty])
+    for ch in "{}[]":
+        assert deduped[0].count(ch) == pretty.count(ch)
@@ -0,0 +1,74 @@
+from agentlab.config_loader import Blueprint, EvalCase
+from agentlab.evaluator import run_evaluations
+from agentlab.llm.cache import ResponseCache
+from agentlab.runner import run_agent
+from agentlab.utils.kvstore import SQLiteStore
+
+
+def test_run_agent_reuses_cached_response(monkeypatch, tmp_path):
+    calls = []
+
+    async def fake_acomplete(prompt: str, **_):
+        calls.append(prompt)
+        return "answer"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    bp = Blueprint(name="t", plan=[{"step": "generate", "name": "final"}])
+    cache = ResponseCache(tmp_path)
+
+    first = run_agent(bp, input_text="q", cache=cache)
+    second = run_agent(bp, input_text="q", cache=cache)
+    other = run_agent(bp, input_text="q", cache=cache, generation_kwargs={"temperature": 0.7})
+    assert (first["cached"], second["cached"], other["cached"]) == (False, True, False)
+    assert second["output"] == "answer"
+    assert len(calls) == 2
+
+    bp.evaluation = [EvalCase(input="q", expected="answer")]
+    summary = run_evaluations(bp, cache=ResponseCache(tmp_path))
+    assert summary["passed"] == 1
+    assert summary["cache"] == {"hits": 1, "misses": 0}
+
+
+def test_sqlite_store_lru_and_ttl(tmp_path):
+    store = SQLiteStore(tmp_path / "kv.sqlite3", max_entries=2)
+    store.set("a", b"1")
+    store.set("b", b"2")
+    assert store.get("a") == b"1"  # refresh a so b is least recently used
+    store.set("c", b"3")
+    assert store.get("b") is None
+    assert store.get("a") == b"1" and store.get("c") == b"3"
+
+    sized = SQLiteStore(tmp_path / "sized.sqlite3", max_bytes=5)
+    sized.set("x", b"abc")
+    sized.set("y", b"def")
+    assert sized.stats() == {"entries": 1, "bytes": 3}
+
+    expiring = SQLiteStore(tmp_path / "ttl.sqlite3", ttl=-1)
+    expiring.set("k", b"v")
+    assert expiring.get("k") is None
+
+
+def test_cli_closes_response_cache(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    import agentlab.runner as R
+    from agentlab.cli import app
+
+    async def fake_acomplete(prompt: str, **_):
+        return "done"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    closed = []
+    original = ResponseCache.close
+    monkeypatch.setattr(ResponseCache, "close", lambda self: closed.append(original(self)))
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: closing\nplan:\n  - step: generate\n")
+    inputs = tmp_path / "in.jsonl"
+    inputs.write_text('"a"\n')
+    cache_args = ["--cache", "--cache-dir", str(tmp_path / "c")]
+    for argv in (["run", str(bp_path), "-i", "hi"], ["batch", str(bp_path), str(inputs)]):
+        res = CliRunner().invoke(app, argv + cache_args)
+        assert res.exit_code == 0, res.output
+    assert len(closed) == 2
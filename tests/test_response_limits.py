@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import orjson
+
+from agentlab.tools.openapi.ingest import ingest_openapi
+from agentlab.tools.registry import get_tool
+from agentlab.tools.runtime.http_tool import ahttp_call, http_call
+from agentlab.tools.runtime.projection import ResponseLimits, project, shape_body
+
+PETS = [
+    {"id": i, "name": f"pet{i}", "tags": [{"name": "t"}], "photos": ["x"] * 50} for i in range(100)
+]
+
+
+def test_projection_selects_paths_and_limits_arrays():
+    doc = {"data": PETS, "meta": {"total": 100, "page": 1}}
+    assert project(doc, ["$.data[*].name", "meta.total"], max_items=2) == {
+        "data": [{"name": "pet0"}, {"name": "pet1"}],
+        "meta": {"total": 100},
+    }
+    assert project(PETS, ["id", "tags.name"], max_items=1) == [{"id": 0, "tags": [{"name": "t"}]}]
+    assert project({"a": 1}, ["missing"]) == {}
+
+
+def test_byte_budget_cuts_the_stream_off_early():
+    pulled = []
+
+    def body():
+        for i in range(1000):
+            pulled.append(i)
+            yield b"x" * 1024
+
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, content=body()))
+    )
+    out = http_call(
+        "GET",
+        "https://big.example.com",
+        "/dump",
+        client=client,
+        limits=ResponseLimits(max_bytes=4096),
+    )
+    # The marker counts against the budget
+    assert out.startswith("x" * 4000) and out.endswith(" …[truncated to 4096 bytes]")
+    assert len(out.encode()) == 4096
+    assert len(pulled) < 10
+
+
+def test_api_tool_limits_from_spec_and_with_args(tmp_path):
+    spec = orjson.loads(
+        orjson.dumps(
+            {
+                "servers": [{"url": "https://pets.example.com"}],
+                "x-agentlab-max-items": 3,
+                "paths": {
+                    "/pets": {"get": {"operationId": "findPets", "x-agentlab-fields": ["name"]}}
+                },
+            }
+        )
+    )
+    path = tmp_path / "spec.json"
+    path.write_bytes(orjson.dumps(spec))
+    ingest_openapi(path, tag="lim", cache_dir=None)
+    tool = get_tool("lim.findPets")
+    assert tool.limits == ResponseLimits(fields=("name",), max_items=3)
+
+    transport = httpx.MockTransport(lambda r: httpx.Response(200, json=PETS))
+    async_client = httpx.AsyncClient(transport=transport)
+    args = tool._request_args({"_max_items": "2", "_fields": "id,name", "_max_bytes": 40})
+    out = asyncio.run(ahttp_call("GET", tool.base_url, tool.path, client=async_client, **args))
+    assert out == '[{"id":0,"nam …[truncated to 40 bytes]'
+    assert tool._request_args({})["limits"].max_items == 3
+    # Junk limits from a with: block are ignored rather than failing the call
+    bad = tool._request_args({"_max_bytes": "abc", "_max_items": "-1"})["limits"]
+    assert bad == ResponseLimits(fields=("name",), max_items=3)
+
+
+def test_unlimited_responses_are_compacted_not_trimmed():
+    body = '{\n  "b": 1,\n  "a": [\n    1,\n    2\n  ],\n  "name": "Zoë"\n}'.encode()
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, content=body))
+    )
+    out = http_call("GET", "https://pets.example.com", "/pet", client=client)
+    assert out == '{"b":1,"a":[1,2],"name":"Zoë"}'  # key order kept, whitespace dropped
+    text = httpx.Client(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, text="plain  text\n"))
+    )
+    assert http_call("GET", "https://pets.example.com", "/txt", client=text) == "plain  text\n"
+    tiny = ResponseLimits(max_bytes=8)
+    assert shape_body(b"abcdefghij", True, tiny) == "abcdefgh"  # no room for the marker
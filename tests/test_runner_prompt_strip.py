@@ -14,3 +14,46 @@ def test_strip_think(monkeypatch):
 
     out = run_agent(bp, input_text="x", strip_think=True)
     assert out["output"] == "Visible"
+
+
+def test_think_filter_matches_regex_on_any_split():
+    import random
+    import re
+
+    from agentlab.llm.think_filter import ThinkFilter
+
+    samples = [
+        "  Hello <think>x</think> world  ",
+        "<think>a</think><think>b</think>c  d\n",
+        "a<think>unterminated",
+        "<<think>>x</think>>",
+        "x </think> y",
+    ]
+    rng = random.Random(0)
+    for text in samples:
+        expected = re.sub(r"<think>[\s\S]*?</think>", "", text).strip()
+        for _ in range(50):
+            f, out, i = ThinkFilter(), [], 0
+            while i < len(text):
+                j = i + rng.randint(1, 4)
+                out.append(f.feed(text[i:j]))
+                i = j
+            assert "".join(out) + f.flush() == expected
+
+
+def test_stream_forwards_visible_tokens(monkeypatch):
+    bp = Blueprint(name="t", plan=[{"step": "generate", "name": "final"}])
+
+    async def fake_acomplete(prompt: str, on_token=None, **_):
+        for tok in ["<thi", "nk>hidden", " stuff</th", "ink>\n\nVis", "ible", " text"]:
+            on_token(tok)
+        return "ignored"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    seen = []
+    out = run_agent(bp, input_text="x", stream=True, strip_think=True, on_token=seen.append)
+    assert seen == ["Vis", "ible", " text"]
+    assert out["output"] == "Visible text"
+    assert out["first_visible_token_ms"] is not None
@@ -13,3 +13,30 @@ def test_render_mapping_nested():
     data = {"a": "{{x}}", "b": {"c": "{{y}}"}, "d": ["{{x}}", 1, {"e": "{{y}}"}]}
     out = render_mapping(data, {"x": "X", "y": "Y"})
     assert out == {"a": "X", "b": {"c": "Y"}, "d": ["X", 1, {"e": "Y"}]}
+
+
+def test_compiled_templates_match_and_are_cached():
+    from agentlab.utils.templates import _compile_accessor, compile_mapping, compile_template
+
+    variables = {"a": {"b": 1}, "a.b": "flat", "x": "X"}
+    expected = {
+        "plain": "plain",
+        "{{ x }}-{{a.b}}": "X-flat",
+        "{{a.c}} tail": "{{a.c}} tail",
+        "open {{x": "open {{x",
+        "{{x}}}}": "X}}",
+        "": "",
+    }
+    for tpl, rendered in expected.items():
+        assert compile_template(tpl).render(variables) == rendered
+        assert render_template(tpl, variables) == rendered
+    assert render_template("{{a.b}}", {"a": {"b": 2}}) == "2"
+    assert render_template("{{ missing.key }}", {}) == "{{missing.key}}"
+    assert compile_template("{{x}}") is compile_template("{{x}}")
+    assert _compile_accessor("a.b") is _compile_accessor("a.b")
+
+    compiled = compile_mapping({"q": "{{x}}", "n": 3, "l": ["{{x}}", {"k": "{{a.b}}"}, [1]]})
+    first = compiled.render(variables)
+    assert first == {"q": "X", "n": 3, "l": ["X", {"k": "flat"}, [1]]}
+    assert compiled.render({"x": "Y"})["q"] == "Y"
+    assert compiled.render(variables) is not first
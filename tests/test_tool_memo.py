@@ -0,0 +1,90 @@
+from agentlab.tools.base import ToolOptions, tool
+from agentlab.tools.memo import TOOL_MEMO, ToolMemo
+from agentlab.tools.registry import get_tool_options, register_tool
+
+
+def test_runner_memoizes_cacheable_tools(monkeypatch):
+    import asyncio
+
+    from agentlab.runner import _aexecute_tool
+
+    def _execute_tool(name, args):
+        return asyncio.run(_aexecute_tool(name, args))
+
+    calls = []
+
+    @tool(cacheable=True)
+    def memo_lookup(q: str, page: int = 1) -> str:
+        calls.append((q, page))
+        return f"result {q} {page}"
+
+    register_tool("memo.lookup", memo_lookup)
+    assert get_tool_options("memo.lookup").cacheable
+
+    assert _execute_tool("memo.lookup", {"q": "a", "page": 1}) == "result a 1"
+    assert _execute_tool("memo.lookup", {"page": 1, "q": "a"}) == "result a 1"  # key order ignored
+    _execute_tool("memo.lookup", {"q": "b"})
+    assert calls == [("a", 1), ("b", 1)]
+    assert TOOL_MEMO.stats()["memo.lookup"] == {"hits": 1, "misses": 2}
+
+
+def test_memo_ttl_lru_and_persistence(tmp_path):
+    memo = ToolMemo()
+    opts = ToolOptions(cacheable=True, max_entries=2)
+    for q in ("a", "b", "c"):
+        memo.set("t", {"q": q}, opts, q.upper())
+    assert memo.get("t", {"q": "a"}, opts) is None  # evicted as least recently used
+    assert memo.get("t", {"q": "c"}, opts) == "C"
+    assert memo.get("t", {"q": "c"}, ToolOptions(cacheable=True, ttl=-1)) is None
+
+    memo.persist_to(tmp_path)
+    memo.set("t", {"q": "d"}, opts, "D")
+    fresh = ToolMemo()
+    fresh.persist_to(tmp_path)
+    assert fresh.get("t", {"q": "d"}, opts) == "D"
+    assert fresh.stats()["t"] == {"hits": 1, "misses": 0}
+
+
+def test_cli_cache_persists_tool_outputs_across_runs(tmp_path, monkeypatch):
+    import json
+
+    from typer.testing import CliRunner
+
+    import agentlab.runner as R
+    from agentlab.cli import app
+
+    async def fake_acomplete(prompt: str, **_):
+        return "done"
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+    calls = []
+
+    @tool(cacheable=True)
+    def persisted_lookup(input: str) -> str:
+        calls.append(input)
+        return f"found {input}"
+
+    register_tool("memo.persisted", persisted_lookup)
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text(
+        "name: memo-cli\nplan:\n  - step: tool_use\n    name: memo.persisted\n  - step: generate\n"
+    )
+    argv = ["run", str(bp_path), "-i", "cats", "--cache", "--cache-dir", str(tmp_path / "c")]
+    for _ in range(2):
+        TOOL_MEMO.clear()  # a new process starts with an empty in-memory memo
+        res = CliRunner().invoke(app, argv)
+        assert res.exit_code == 0, res.output
+    assert calls == ["cats"]
+    result = json.loads(res.output[res.output.index("{") :])
+    assert result["tool_cache"]["memo.persisted"] == {"hits": 1, "misses": 0}
+
+
+def test_memo_treats_store_errors_as_misses(tmp_path):
+    memo = ToolMemo()
+    opts = ToolOptions(cacheable=True)
+    memo.persist_to(tmp_path)
+    memo._store._conn.close()  # every store call now raises sqlite3.ProgrammingError
+    memo.set("t", {"q": "a"}, opts, "A")
+    assert memo.get("t", {"q": "a"}, opts) == "A"  # still served from memory
+    assert memo.get("t", {"q": "b"}, opts) is None
+    assert memo.stats()["t"] == {"hits": 1, "misses": 1}
@@ -0,0 +1,66 @@
+import json
+
+from typer.testing import CliRunner
+
+from agentlab.cli import app
+from agentlab.config_loader import Blueprint
+from agentlab.runner import run_agent
+
+
+def _patch_llm(monkeypatch):
+    async def fake_acomplete(prompt: str, **_):
+        return "traced"
+
+    import agentlab.runner as R
+
+    monkeypatch.setattr(R, "acomplete", fake_acomplete)
+
+
+def test_run_agent_timings_block(monkeypatch):
+    _patch_llm(monkeypatch)
+    bp = Blueprint(
+        name="t",
+        plan=[
+            {"step": "tool_use", "name": "internalSearch", "with": {"query": "{{input}}"}},
+            {"step": "generate"},
+        ],
+    )
+    out = run_agent(bp, input_text="hello", timings=True)
+    spans = out["timings"]["spans"]
+    names = [s["name"] for s in spans]
+    assert "render_mapping" in names and "load_plugin_tools" in names
+    tool = next(s for s in spans if s["name"] == "tool")
+    assert tool["tool"] == "internalSearch" and tool["output_bytes"] > 0
+    assert out["timings"]["total_ms"] >= tool["duration_ms"]
+    assert "timings" not in run_agent(bp, input_text="hello")
+
+
+def test_cli_trace_writes_chrome_trace(monkeypatch, tmp_path):
+    _patch_llm(monkeypatch)
+    bp_path = tmp_path / "bp.yaml"
+    bp_path.write_text("name: traced\nplan:\n  - step: generate\n")
+    trace_path = tmp_path / "trace.json"
+    res = CliRunner().invoke(app, ["run", str(bp_path), "-i", "x", "--trace", str(trace_path)])
+    assert res.exit_code == 0, res.output
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert {"load_blueprint", "run_agent"} <= {e["name"] for e in events}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_cli_eval_trace_keeps_blueprints_in_process(monkeypatch, tmp_path):
+    _patch_llm(monkeypatch)
+    for name in ("alpha", "beta"):
+        (tmp_path / f"{name}.yaml").write_text(
+            f"name: {name}\nplan:\n  - step: generate\nevaluation:\n  - input: q\n"
+        )
+    trace_path = tmp_path / "trace.json"
+    res = CliRunner().invoke(app, ["eval", str(tmp_path), "--trace", str(trace_path)])
+    assert res.exit_code == 0, res.output
+    assert json.loads(res.output[res.output.index("{") :])["timing"]["workers"] == 1
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert sum(e["name"] == "load_blueprint" for e in events) == 2
+
+    res = CliRunner().invoke(
+        app, ["eval", str(tmp_path), "--trace", str(trace_path), "--workers", "2"]
+    )
+    assert res.exit_code != 0 and "--workers 1" in res.output